@@ -3,8 +3,24 @@ Trabalho Prático - Integração por Frações Parciais
 Sistema interativo para resolução de integrais racionais
 """
 
+import cmath
+import copy
+import dis
+import hashlib
+import io
+import json
+import linecache
 import math
+import queue
+import random
 import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from fractions import Fraction
+from functools import lru_cache, partial, wraps
 
 # CLASSE AUXILIAR: POLINÔMIO
 class Polinomio:
@@ -25,6 +41,10 @@ class Polinomio:
         return len(self.coefs) - 1
     
     def __str__(self):
+        return self.formata()
+    
+    def formata(self, precisao=4):
+        """Representação textual com a precisão (algarismos significativos) dada"""
         if not self.coefs:
             return "0"
         
@@ -41,17 +61,17 @@ class Polinomio:
             valor = abs(c)
             
             if i == 0:
-                termos.append(f"{sinal}{valor:.4g}")
+                termos.append(f"{sinal}{valor:.{precisao}g}")
             elif i == 1:
                 if abs(valor - 1) < 1e-10:
                     termos.append(f"{sinal}x")
                 else:
-                    termos.append(f"{sinal}{valor:.4g}x")
+                    termos.append(f"{sinal}{valor:.{precisao}g}x")
             else:
                 if abs(valor - 1) < 1e-10:
                     termos.append(f"{sinal}x^{i}")
                 else:
-                    termos.append(f"{sinal}{valor:.4g}x^{i}")
+                    termos.append(f"{sinal}{valor:.{precisao}g}x^{i}")
         
         return "".join(termos) if termos else "0"
 
@@ -122,8 +142,8 @@ def parsePolinomio(expressao):
     # Substitui formas comuns
     expressao = expressao.replace("**", "^")
     
-    # Verifica se há produto de fatores lineares (forma fatorada)
-    if expressao.count('(') >= 2 and expressao.count(')') >= 2:
+    # Verifica se há produto de fatores (forma fatorada), ex: (x-1)(x-2), (x-1)^3, x(x+1)
+    if '(' in expressao and ')' in expressao:
         return extrairFatores(expressao)
     
     # Adiciona sinal + no início se não houver
@@ -191,20 +211,47 @@ def extrairFatores(expressao):
     Extrai fatores individuais sem expandir.
     Exemplos:
         "(3x-2)(x+5)" → {'fatorado': True, 'fatores': [[coefs1], [coefs2]]}
+        "(x-3)^2" → {'fatorado': True, 'fatores': [[-3, 1], [-3, 1]]}
+        "x(x+1)" → {'fatorado': True, 'fatores': [[0, 1], [1, 1]]}
+        "2(x-1)(x+1)" → {'fatorado': True, 'fatores': [[-2, 2], [1, 1]]}
+    
+    Fatores constantes são absorvidos pelo primeiro fator não constante.
     """
-    # Extrai os fatores entre parênteses
-    fatores_str = re.findall(r'\([^)]+\)', expressao)
+    # Extrai os fatores entre parênteses (com expoente opcional) e os
+    # monômios soltos entre eles
+    fatores_str = re.findall(r'\(([^)]+)\)(?:\^(\d+))?|([^()]+)', expressao)
     
     if not fatores_str:
         return parsePolinomio(expressao)
     
-    # Parseia cada fator
+    # Parseia cada fator, repetindo-o conforme o expoente
     fatores = []
-    for fator_str in fatores_str:
-        # Remove parênteses
-        fator_limpo = fator_str[1:-1]
+    constante = 1.0
+    for posicao, (fator_limpo, expoente, solto) in enumerate(fatores_str):
+        if solto:
+            # Monômio fora dos parênteses, ex: x(x+1) ou -2(x-1)(x+1). Só o
+            # primeiro pode ter sinal: depois de um parêntese, "+1" em
+            # (x-1)^2+1 é uma soma, e não um fator
+            solto = solto.replace('*', '')
+            monomio = re.fullmatch(r'[+-]?(\d+\.?\d*|\.\d+)?([xX](\^\d+)?)?', solto)
+            if not monomio or (posicao > 0 and solto.startswith(('+', '-'))):
+                raise ValueError(f"Forma fatorada inválida: '{expressao}'. "
+                                 "Use apenas produtos de fatores ou expanda o polinômio")
+            if solto in ('', '+'):
+                continue
+            fator_limpo = '-1' if solto == '-' else solto
         coefs = parsePolinomioSimples(fator_limpo)
-        fatores.append(coefs)
+        repeticoes = int(expoente) if expoente else 1
+        if len(Polinomio(coefs).coefs) < 2:
+            constante *= coefs[0] ** repeticoes
+            continue
+        for _ in range(repeticoes):
+            fatores.append(coefs)
+    
+    if not fatores:
+        return {'fatorado': True, 'fatores': [[constante]]}
+    if constante != 1.0:
+        fatores[0] = [constante * c + 0.0 for c in fatores[0]]
     
     return {'fatorado': True, 'fatores': fatores}
 
@@ -279,6 +326,880 @@ def multiplicarPolinomios(p1, p2):
     
     return resultado
 
+
+def expandePolinomio(polinomio):
+    """
+    Retorna a lista de coeficientes, expandindo a forma fatorada se necessário.
+    """
+    if isinstance(polinomio, dict) and polinomio.get('fatorado'):
+        fatores = polinomio['fatores']
+        expandido = fatores[0]
+        for i in range(1, len(fatores)):
+            expandido = multiplicarPolinomios(expandido, fatores[i])
+        return expandido
+    return polinomio
+
+
+def somaPolinomios(p1, p2):
+    """
+    Soma dois polinômios (listas de coeficientes).
+    """
+    resultado = [0] * max(len(p1), len(p2))
+    for i, c in enumerate(p1):
+        resultado[i] += c
+    for i, c in enumerate(p2):
+        resultado[i] += c
+    return resultado
+
+
+def subtraiPolinomios(p1, p2):
+    """
+    Subtrai p2 de p1 (listas de coeficientes).
+    """
+    resultado = [0] * max(len(p1), len(p2))
+    for i, c in enumerate(p1):
+        resultado[i] += c
+    for i, c in enumerate(p2):
+        resultado[i] -= c
+    return resultado
+
+
+def avaliaPolinomio(coefs, x):
+    """
+    Avalia o polinômio em x pelo método de Horner (x pode ser complexo).
+    """
+    valor = 0
+    for c in reversed(coefs):
+        valor = valor * x + c
+    return valor
+
+
+def derivaPolinomio(coefs):
+    """
+    Retorna os coeficientes da derivada do polinômio.
+    """
+    if len(coefs) < 2:
+        return [0]
+    return [i * coefs[i] for i in range(1, len(coefs))]
+
+
+def divisaoSintetica(coefs, r):
+    """
+    Divide o polinômio por (x - r) pelo dispositivo de Briot-Ruffini.
+
+    Retorna:
+        (quociente, resto)
+    """
+    n = len(coefs) - 1
+    if n < 1:
+        return [0], coefs[0] if coefs else 0
+
+    quociente = [0] * n
+    acumulado = coefs[n]
+    for i in range(n - 1, -1, -1):
+        quociente[i] = acumulado
+        acumulado = coefs[i] + acumulado * r
+
+    return quociente, acumulado
+
+
+def dividePolinomios(p, d):
+    """
+    Divisão longa de polinômios: p = d·quociente + resto.
+
+    Retorna:
+        (quociente, resto)
+    """
+    d = Polinomio(d).coefs
+    resto = list(p)
+    grau_d = len(d) - 1
+
+    if len(resto) - 1 < grau_d:
+        return [0], resto
+
+    quociente = [0] * (len(resto) - grau_d)
+    for i in range(len(resto) - 1 - grau_d, -1, -1):
+        fator = resto[i + grau_d] / d[grau_d]
+        quociente[i] = fator
+        for j in range(grau_d + 1):
+            resto[i + j] -= fator * d[j]
+
+    resto = resto[:grau_d] if grau_d > 0 else [0]
+    return quociente, resto
+
+
+# MDC DE POLINÔMIOS E DECOMPOSIÇÃO LIVRE DE QUADRADOS
+def _limpaPolinomio(p, escala, tol):
+    """Zera coeficientes desprezíveis em relação à escala e remove zeros à direita"""
+    limpo = [0.0 if abs(c) <= tol * escala else c for c in p]
+    while len(limpo) > 1 and limpo[-1] == 0:
+        limpo.pop()
+    return limpo
+
+
+def _removeZeros(p):
+    """Remove zeros exatos à direita (modo exato)"""
+    p = list(p)
+    while len(p) > 1 and p[-1] == 0:
+        p.pop()
+    return p
+
+
+def _ehZero(p):
+    return all(c == 0 for c in p)
+
+
+def _monico(p):
+    return [c / p[-1] for c in p]
+
+
+def paraFracoes(p, max_denominador=None):
+    """
+    Converte os coeficientes para Fraction (modo exato). Todo float já é
+    um racional exato, então a conversão não perde nada; com
+    max_denominador, aproxima cada coeficiente pelo racional mais próximo
+    com denominador limitado (pode zerar coeficientes pequenos).
+    """
+    if max_denominador is None:
+        return _removeZeros([Fraction(c) for c in p])
+    return _removeZeros([Fraction(c).limit_denominator(max_denominador) for c in p])
+
+
+def mdcPolinomios(p, q, tol=1e-9):
+    """
+    MDC de dois polinômios pelo algoritmo de Euclides, com tolerância
+    para coeficientes de ponto flutuante. O resultado é mônico.
+    """
+    a = Polinomio(p).coefs
+    b = Polinomio(q).coefs
+    if _ehZero(b):
+        return _monico(a)
+
+    while not _ehZero(b):
+        escala = max(abs(c) for c in a)
+        _, r = dividePolinomios(a, b)
+        a, b = b, _limpaPolinomio(r, escala, tol)
+
+    return _monico(a)
+
+
+def mdcEuclidesExato(p, q):
+    """
+    MDC pelo algoritmo de Euclides com aritmética exata (Fraction).
+    O resultado é mônico.
+    """
+    a, b = paraFracoes(p), paraFracoes(q)
+    if len(a) < len(b):
+        a, b = b, a
+
+    while not _ehZero(b):
+        _, r = dividePolinomios(a, b)
+        a, b = b, _removeZeros(r)
+
+    return _monico(a)
+
+
+def pseudoResto(a, b):
+    """
+    Pseudo-resto: resto de lc(b)^(grau(a) - grau(b) + 1)·a dividido por b,
+    calculado sem divisões.
+    """
+    resto = list(a)
+    grau_b = len(b) - 1
+    lider = b[-1]
+
+    for i in range(len(resto) - 1, grau_b - 1, -1):
+        fator = resto[i]
+        resto = [c * lider for c in resto]
+        for j in range(grau_b + 1):
+            resto[i - grau_b + j] -= fator * b[j]
+        resto.pop()
+
+    return _removeZeros(resto) if resto else [0]
+
+
+def mdcSubresultante(p, q):
+    """
+    MDC pela sequência de restos subresultantes (modo exato), que controla o
+    crescimento dos coeficientes sem calcular conteúdos a cada passo.
+    O resultado é mônico.
+    """
+    a, b = paraFracoes(p), paraFracoes(q)
+    if len(a) < len(b):
+        a, b = b, a
+    if _ehZero(b):
+        return _monico(a)
+
+    g = h = Fraction(1)
+    while True:
+        delta = len(a) - len(b)
+        r = pseudoResto(a, b)
+        if _ehZero(r):
+            break
+        if len(r) == 1:
+            return [Fraction(1)]
+        a = b
+        b = [c / (g * h**delta) for c in r]
+        g = a[-1]
+        h = h**(1 - delta) * g**delta
+
+    return _monico(b)
+
+
+def euclidesEstendido(p, q, tol=1e-9, exato=False):
+    """
+    Algoritmo de Euclides estendido: s·p + t·q = mdc(p, q), com mdc mônico.
+
+    Parâmetros:
+        exato: usa aritmética exata (Fraction) em vez da tolerância tol
+
+    Retorna:
+        (s, t, mdc)
+    """
+    if exato:
+        a, b = paraFracoes(p), paraFracoes(q)
+        s0, s1 = [Fraction(1)], [Fraction(0)]
+        t0, t1 = [Fraction(0)], [Fraction(1)]
+        limpa = lambda r, escala: _removeZeros(r)
+        apara = _removeZeros
+    else:
+        a, b = Polinomio(p).coefs, Polinomio(q).coefs
+        s0, s1 = [1.0], [0.0]
+        t0, t1 = [0.0], [1.0]
+        limpa = lambda r, escala: _limpaPolinomio(r, escala, tol)
+        apara = lambda r: Polinomio(r).coefs
+
+    while not _ehZero(b):
+        escala = max(abs(c) for c in a)
+        quociente, r = dividePolinomios(a, b)
+        a, b = b, limpa(r, escala)
+        s0, s1 = s1, apara(subtraiPolinomios(s0, multiplicarPolinomios(quociente, s1)))
+        t0, t1 = t1, apara(subtraiPolinomios(t0, multiplicarPolinomios(quociente, t1)))
+
+    lider = a[-1]
+    return [c / lider for c in s0], [c / lider for c in t0], [c / lider for c in a]
+
+
+def decomposicaoLivreDeQuadrados(p, exato=False):
+    """
+    Decomposição livre de quadrados pelo algoritmo de Yun:
+        p = lider · P₁ · P₂² · ... · Pₘ^m,  com Pᵢ mônicos, livres de
+        quadrados e primos entre si.
+    
+    Parâmetros:
+        exato: usa aritmética exata (Fraction) e MDC por subresultantes
+    
+    Retorna:
+        [(Pᵢ, i), ...] apenas com os Pᵢ não constantes
+    """
+    if exato:
+        a = paraFracoes(p)
+        mdc = mdcSubresultante
+        limpa = _removeZeros
+    else:
+        a = Polinomio(p).coefs
+        mdc = mdcPolinomios
+        limpa = lambda r: _limpaPolinomio(r, max(abs(c) for c in a), 1e-9)
+    
+    if len(a) < 2:
+        return []
+    
+    derivada = derivaPolinomio(a)
+    b = mdc(a, derivada)
+    c, _ = dividePolinomios(a, b)
+    d, _ = dividePolinomios(derivada, b)
+    d = limpa(subtraiPolinomios(d, derivaPolinomio(c)))
+    
+    partes = []
+    i = 1
+    while len(limpa(c)) > 1:
+        if i >= len(a):
+            # Nenhuma multiplicidade passa do grau: em ponto flutuante um MDC
+            # espúrio (raízes muito próximas) impede a convergência, e a
+            # decomposição é refeita em aritmética exata
+            return decomposicaoLivreDeQuadrados(p, exato=True)
+        c = limpa(c)
+        fator = mdc(c, d) if not _ehZero(d) else _monico(c)
+        c, _ = dividePolinomios(c, fator)
+        d, _ = dividePolinomios(d, fator)
+        d = limpa(subtraiPolinomios(d, derivaPolinomio(c)))
+        if len(fator) > 1:
+            partes.append((fator, i))
+        i += 1
+    
+    return partes
+
+
+def _livreDeQuadradosFatorado(fatores):
+    """
+    Decomposição livre de quadrados (exata) de um produto na forma
+    fatorada, sem expandi-lo: junta as partes de Yun de cada fator, somando
+    as multiplicidades das partes iguais, e agrupa as partes pela
+    multiplicidade total. Só vale se as partes distintas forem primas entre
+    si, o caso comum como (x - 1)³(2x + 1); senão devolve None.
+
+    Retorna:
+        (lider, [(Pᵢ, i), ...]) no formato de decomposicaoLivreDeQuadrados, ou None
+    """
+    lider = Fraction(1)
+    partes = []
+    for fator in fatores:
+        f = _removeZeros(paraFracoes(fator))
+        lider *= f[-1]
+        livres = [(_monico(f), 1)] if len(f) == 2 else decomposicaoLivreDeQuadrados(f, exato=True)
+        for parte, mult in livres:
+            for item in partes:
+                if item[0] == parte:
+                    item[1] += mult
+                    break
+            else:
+                partes.append([parte, mult])
+
+    for i in range(len(partes)):
+        for j in range(i):
+            # Lineares mônicos diferentes já são primos entre si
+            if len(partes[i][0]) == len(partes[j][0]) == 2:
+                continue
+            if len(mdcSubresultante(partes[i][0], partes[j][0])) > 1:
+                return None
+
+    agrupadas = {}
+    for parte, mult in partes:
+        agrupadas[mult] = multiplicarPolinomios(agrupadas.get(mult, [Fraction(1)]), parte)
+    return lider, [(P, i) for i, P in sorted(agrupadas.items())]
+
+
+def simplificaFracao(numerador, denominador):
+    """
+    Cancela o fator comum entre numerador e denominador (MDC exato por
+    subresultantes), antes da validação.
+    
+    Exemplo:
+        (x + 1)/(x(x + 1)) → 1/x
+    
+    Retorna:
+        (numerador, denominador, fator_cancelado) — o fator é None e a
+        entrada é devolvida sem alterações se a fração já é irredutível
+    """
+    num = expandePolinomio(numerador)
+    den = expandePolinomio(denominador)
+    
+    if _ehZero(paraFracoes(num)) or _ehZero(paraFracoes(den)):
+        return numerador, denominador, None
+    
+    mdc = mdcSubresultante(num, den)
+    if len(mdc) < 2:
+        return numerador, denominador, None
+    
+    num_simplificado, _ = dividePolinomios(paraFracoes(num), mdc)
+    den_simplificado, _ = dividePolinomios(paraFracoes(den), mdc)
+    
+    return ([float(c) for c in num_simplificado],
+            [float(c) for c in den_simplificado],
+            [float(c) for c in mdc])
+
+
+# FATORAÇÃO GERAL (FATORES REPETIDOS)
+def raizesPolinomio(coefs, max_iter=500, tol=1e-14):
+    """
+    Calcula todas as raízes (complexas) do polinômio pelo método de
+    Durand-Kerner.
+    """
+    p = Polinomio(coefs).coefs
+    n = len(p) - 1
+    if n < 1:
+        return []
+
+    monico = [c / p[-1] for c in p]
+    raizes = [complex(0.4, 0.9) ** k for k in range(n)]
+
+    for _ in range(max_iter):
+        variacao = 0
+        for i in range(n):
+            produto = 1
+            for j in range(n):
+                if j != i:
+                    produto *= raizes[i] - raizes[j]
+            if produto == 0:
+                produto = 1e-12
+            delta = avaliaPolinomio(monico, raizes[i]) / produto
+            raizes[i] -= delta
+            variacao = max(variacao, abs(delta))
+        if variacao < tol:
+            break
+
+    return raizes
+
+
+def _arredonda(valor, tol=1e-8):
+    """Aproxima valores muito próximos de um inteiro"""
+    inteiro = round(valor)
+    return float(inteiro) if abs(valor - inteiro) < tol else valor
+
+
+def refinaRaiz(coefs, z, multiplicidade, max_iter=50):
+    """
+    Refina uma raiz de multiplicidade m pelo método de Newton aplicado à
+    derivada de ordem m-1 (onde a raiz é simples).
+    """
+    p = list(coefs)
+    for _ in range(multiplicidade - 1):
+        p = derivaPolinomio(p)
+    dp = derivaPolinomio(p)
+
+    for _ in range(max_iter):
+        derivada = avaliaPolinomio(dp, z)
+        if derivada == 0:
+            break
+        delta = avaliaPolinomio(p, z) / derivada
+        z -= delta
+        if abs(delta) < 1e-15 * (1 + abs(z)):
+            break
+
+    return z
+
+
+def fatoraPolinomio(coefs):
+    """
+    Fatora um polinômio real em fatores lineares e quadráticos
+    irredutíveis mônicos, com suas multiplicidades.
+
+    Exemplo:
+        [0, 0, -1, 0, 1] (x⁴ - x²) → (1, [([0, 1], 2), ([1, 1], 1), ([-1, 1], 1)])
+
+    Retorna:
+        (coeficiente_lider, [(fator, multiplicidade), ...])
+    """
+    p = Polinomio(coefs).coefs
+    lineares = []
+    quadraticos = []
+
+    # Cada parte livre de quadrados só tem raízes simples, que o método
+    # numérico encontra com precisão; a multiplicidade vem da decomposição.
+    # Raízes próximas continuam distintas: não há agrupamento numérico
+    exato = all(float(c).is_integer() for c in p)
+    for parte, mult in decomposicaoLivreDeQuadrados(p, exato=exato):
+        parte = [float(c) for c in parte]
+        for z in raizesPolinomio(parte):
+            z = refinaRaiz(parte, z, 1)
+            if abs(z.imag) < 1e-6 * (1 + abs(z)):
+                r = _arredonda(z.real)
+                lineares.append(([-r if r else 0.0, 1.0], mult))
+            elif z.imag > 0:
+                # Par conjugado z, z̄ → x² - 2Re(z)x + |z|²
+                b = _arredonda(-2 * z.real)
+                c = _arredonda(abs(z) ** 2)
+                quadraticos.append(([c, b if b else 0.0, 1.0], mult))
+
+    lineares.sort(key=lambda f: -f[0][0])
+    quadraticos.sort(key=lambda f: (f[0][1], f[0][0]))
+    return p[-1], lineares + quadraticos
+
+
+def fatoraFatores(fatores):
+    """
+    Fatora cada fator informado na forma fatorada e junta os fatores
+    iguais, somando as multiplicidades.
+
+    Retorna:
+        (coeficiente_lider, [(fator, multiplicidade), ...])
+    """
+    lider = 1.0
+    agrupados = []
+
+    for fator in fatores:
+        lider_fator, fatores_fator = fatoraPolinomio(fator)
+        lider *= lider_fator
+        for novo, mult in fatores_fator:
+            for i, (existente, m) in enumerate(agrupados):
+                if len(existente) == len(novo) and all(abs(a - b) < 1e-8 for a, b in zip(existente, novo)):
+                    agrupados[i] = (existente, m + mult)
+                    break
+            else:
+                agrupados.append((novo, mult))
+
+    lineares = sorted([f for f in agrupados if len(f[0]) == 2], key=lambda f: -f[0][0])
+    quadraticos = sorted([f for f in agrupados if len(f[0]) == 3], key=lambda f: (f[0][1], f[0][0]))
+    return lider, lineares + quadraticos
+
+
+def formataFator(fator, multiplicidade=1, precisao=4):
+    """
+    Representação textual de um fator mônico elevado à multiplicidade.
+    """
+    expoentes = {1: "", 2: "²", 3: "³", 4: "⁴", 5: "⁵", 6: "⁶", 7: "⁷", 8: "⁸", 9: "⁹"}
+    expoente = expoentes.get(multiplicidade, f"^{multiplicidade}")
+
+    if len(fator) == 2:
+        r = -fator[0]
+        base = "(x)" if abs(r) < 1e-10 else f"(x - {_numero(r, precisao)})"
+    else:
+        base = f"(x² + {_numero(fator[1], precisao)}x + {_numero(fator[0], precisao)})"
+
+    return base + expoente
+
+
+def _serieTaylor(coefs, z, ordem):
+    """Coeficientes de p(z + t) em t até t^(ordem-1), por divisões sintéticas sucessivas"""
+    serie = []
+    for _ in range(ordem):
+        coefs, resto = divisaoSintetica(coefs, z)
+        serie.append(resto)
+    return serie
+
+
+def _divideSerie(a, b):
+    """Quociente a/b de séries de potências, truncado no comprimento de a"""
+    b = list(b) + [0] * (len(a) - len(b))
+    c = []
+    for m in range(len(a)):
+        c.append((a[m] - sum(b[i] * c[m - i] for i in range(1, m + 1))) / b[0])
+    return c
+
+
+def coeficientesFatorRepetido(numerador, fator, multiplicidade, outros, lider=1.0):
+    """
+    Calcula os numeradores das frações parciais associadas a
+    fator^multiplicidade, sendo denominador = lider · fator^multiplicidade · Π outros.
+
+    Em vez de montar um sistema linear, usa a série de Taylor de
+    h = N/cofator em torno da raiz z do fator (real para fatores lineares,
+    complexa para quadráticos), t = x - z:
+        linear:     N/(cofator·t^k) = Σ hₘ·t^(m-k)  →  numerador de t^(k-m) é hₘ
+        quadrático: os dígitos (αⱼx + βⱼ) da expansão fator-ádica de
+                    N·cofator⁻¹ saem um a um de h(z), dividindo h por
+                    fator = t·(t + z - z̄) a cada passo
+    A série do cofator é montada fator a fator, sem expandi-lo: perto de
+    raízes próximas o cofator expandido perde todos os algarismos.
+
+    Parâmetros:
+        outros: [(fator, multiplicidade), ...] dos demais fatores
+
+    Retorna:
+        lista [(numerador_termo, potencia), ...] com potências crescentes
+    """
+    linear = len(fator) == 2
+    if linear:
+        z = -fator[0] / fator[1]
+    else:
+        c, b, a = fator
+        z = complex(-b / (2*a), math.sqrt(4*a*c - b**2) / (2*a))
+
+    k = multiplicidade
+    h = _serieTaylor(numerador, z, k)
+    for outro, mult_outro in outros:
+        serie = _serieTaylor(outro, z, k)
+        for _ in range(mult_outro):
+            h = _divideSerie(h, serie)
+    h = [v / (lider * fator[-1] ** k) for v in h]
+
+    if linear:
+        return [([h[k - j]], j) for j in range(1, k + 1)]
+
+    termos = []
+    for j in range(k, 0, -1):
+        # Polinômio real αx + β que vale h(z) em z (e o conjugado em z̄)
+        alfa = h[0].imag / z.imag
+        beta = h[0].real - alfa * z.real
+        termos.append(([beta, alfa], j))
+        if j > 1:
+            # h ← (h - (α(z + t) + β))/(t·(t + z - z̄)), com fator mônico
+            h[0] -= alfa * z + beta
+            h[1] -= alfa
+            h = _divideSerie(h[1:], [z - z.conjugate(), 1])
+
+    termos.reverse()
+    return termos
+
+
+def formaTermo(termo, precisao=4):
+    """
+    Representação textual de um termo da decomposição.
+    """
+    tipo = termo['tipo']
+    
+    if tipo in ('linear', 'linear_repetido'):
+        forma = f"{termo['coeficiente']:.{precisao}g} / (x - {termo['raiz']:.{precisao}g})"
+    elif tipo == 'linear_geral':
+        b, a = termo['fator'][0], termo['fator'][1]
+        forma = f"{termo['coeficiente']:.{precisao}g} / ({a:.{precisao}g}x + {b:.{precisao}g})"
+    else:
+        C, D = termo['numerador']
+        a, b, c = termo['denominador']
+        if abs(a - 1) < 1e-10 and abs(b) < 1e-10:
+            denominador = f"x² + {c:.{precisao}g}"
+        else:
+            denominador = f"{a:.{precisao}g}x² + {b:.{precisao}g}x + {c:.{precisao}g}"
+        forma = f"({C:.{precisao}g}x + {D:.{precisao}g}) / ({denominador})"
+    
+    if 'potencia' in termo:
+        forma += f"^{termo['potencia']}"
+    return forma
+
+
+def termosNaoNulos(decomposicao, tol=1e-12):
+    """
+    Termos da decomposição com coeficiente não nulo (em relação ao maior
+    coeficiente). Os termos nulos continuam em resultado['decomposicao'],
+    que mantém a estrutura completa usada pela SessaoIntegral, mas não
+    são integrados nem exibidos.
+    """
+    def coeficientes(termo):
+        return [termo['coeficiente']] if 'coeficiente' in termo else list(termo['numerador'])
+    
+    escala = max((abs(c) for termo in decomposicao for c in coeficientes(termo)), default=0.0)
+    return [termo for termo in decomposicao if any(abs(c) > tol * escala for c in coeficientes(termo))]
+
+
+def montaTermoParcial(fator, numerador, potencia):
+    """
+    Monta o dicionário de um termo numerador/fator^potencia da decomposição.
+    """
+    if len(fator) == 2:
+        termo = {
+            'tipo': 'linear',
+            'coeficiente': numerador[0],
+            'raiz': 0.0 - fator[0]  # evita raiz -0.0
+        }
+        if potencia > 1:
+            termo['tipo'] = 'linear_repetido'
+            termo['potencia'] = potencia
+    else:
+        C = numerador[1] if len(numerador) > 1 else 0
+        D = numerador[0]
+        c, b, a = fator
+        termo = {
+            'tipo': 'quadratico',
+            'numerador': (C, D),
+            'denominador': (a, b, c)
+        }
+        if potencia > 1:
+            termo['tipo'] = 'quadratico_repetido'
+            termo['potencia'] = potencia
+    
+    termo['forma'] = formaTermo(termo)
+    return termo
+
+
+def infoFatoracaoGeral(lider, fatores_lista):
+    """
+    Monta o dicionário de informações para o tipo de fatoração 'geral'.
+    """
+    repetido = any(mult > 1 for _, mult in fatores_lista)
+    info = {
+        'descricao': 'Fatores lineares/quadráticos com multiplicidade' if repetido
+                     else 'Produto de fatores lineares/quadráticos distintos',
+        'coeficiente_lider': lider,
+        'fatores_lista': fatores_lista
+    }
+    info['fatores'] = formataFatoracao('geral', info)
+    return info
+
+
+def formataFatoracao(tipo, info, precisao=4):
+    """
+    Representação textual dos fatores do denominador, montada a partir das
+    informações estruturadas de identificaTipoFatoracao na precisão dada.
+    """
+    if tipo == 'linear_fatorado':
+        return " × ".join(f"({_numero(a, precisao)}x + {_numero(b, precisao)})"
+                          for b, a in info['fatores'] if abs(a) > 1e-10)
+    if tipo == 'misto_fatorado':
+        return " × ".join(f"({formataQuadratico(f[2], f[1], f[0], precisao)})" for f in info['fatores'])
+    if tipo == 'quadratico_complexo':
+        a, b, c = info['coeficientes']
+        return f"{_numero(a, precisao)}x² + {_numero(b, precisao)}x + {_numero(c, precisao)}"
+
+    lider = _numero(info.get('coeficiente_lider', 1), precisao)
+    if tipo == 'linear_dupla':
+        return f"({lider})(x - {_numero(info['raizes'][0], precisao)})²"
+    if tipo == 'linear':
+        x1, x2 = info['raizes']
+        return f"({lider})(x - {_numero(x1, precisao)})(x - {_numero(x2, precisao)})"
+    if tipo == 'misto':
+        p1, p2 = info['valores']
+        return f"({lider})(x² + {_numero(p1, precisao)})(x² + {_numero(p2, precisao)})"
+    if tipo == 'geral':
+        fatores = "".join(formataFator(f, m, precisao) for f, m in info['fatores_lista'])
+        if abs(info['coeficiente_lider'] - 1) > 1e-10:
+            fatores = f"({lider})" + fatores
+        return fatores
+    return info.get('fatores', '')
+
+# REDUÇÃO DE HERMITE (PARTE RACIONAL)
+def reducaoHermite(numerador, denominador, exato=True):
+    """
+    Redução de Hermite sobre a decomposição livre de quadrados de D,
+    calculada uma única vez (algoritmo de Yun):
+    
+        D = lider · Π Qᵢ^i,   N/D = Σ Aᵢ/Qᵢ^i,   Aᵢ = (N/lider)·(D/Qᵢ^i)⁻¹ mod Qᵢ^i
+    
+    Como mdc(Q, Q') = 1, cada passo escreve a = s·Q + t·Q' e reduz a potência:
+    
+        ∫ a/Q^j dx = -t/((j-1)·Q^(j-1)) + ∫ (s + t'/(j-1))/Q^(j-1) dx
+    
+    Os termos g/Q^j da parte racional saem diretamente, sem expandir as
+    potências (bem condicionados perto de polos múltiplos próximos), e
+    D* = Π Qᵢ reaproveita os mesmos fatores:
+    
+        ∫ N/D dx = Σ g/Q^j + ∫ R/D* dx
+    
+    Parâmetros:
+        denominador: lista de coeficientes OU dicionário com forma fatorada
+                     (a decomposição parte dos fatores, sem expandir D)
+        exato: faz as contas com Fraction (todo float é um racional exato)
+               e MDC por subresultantes; com False, usa ponto flutuante
+               com tolerância, que perde precisão em multiplicidades altas
+    
+    Retorna:
+        (termos, R, D*, partes) com termos = [(g, Q, j), ...], grau(g) < grau(Q),
+        D* mônico e partes = [Q₁, Q₂, ...] os fatores de D* = Π Qᵢ;
+        coeficientes Fraction no modo exato
+    """
+    fatorado = isinstance(denominador, dict) and denominador.get('fatorado')
+    decomposicao = _livreDeQuadradosFatorado(denominador['fatores']) if fatorado and exato else None
+    if decomposicao is None:
+        D = expandePolinomio(denominador)
+        D = paraFracoes(D) if exato else Polinomio(D).coefs
+        decomposicao = D[-1], decomposicaoLivreDeQuadrados(D, exato=exato)
+    lider, fatores = decomposicao
+    
+    if exato:
+        A = paraFracoes(expandePolinomio(numerador))
+        apara = _removeZeros
+    else:
+        A = Polinomio(expandePolinomio(numerador)).coefs
+        apara = lambda r: Polinomio(r).coefs
+    A = [c / lider for c in A]
+    
+    termos = []
+    restos = []
+    for i, (Q, e) in enumerate(fatores):
+        # Só importam A e o cofator D/(lider·Q^e) módulo Q^e: reduzindo a
+        # cada produto, nenhuma conta passa do grau de Q^e
+        potencia = [1]
+        for _ in range(e):
+            potencia = multiplicarPolinomios(potencia, Q)
+        cofator = [1]
+        for k, (outro, mult) in enumerate(fatores):
+            if k != i:
+                for _ in range(mult):
+                    _, cofator = dividePolinomios(multiplicarPolinomios(cofator, outro), potencia)
+        
+        # Um único Euclides módulo Q: w = (cofator·Q')⁻¹ dá cofator⁻¹ = w·Q'
+        # e Q'⁻¹ = w·cofator, ambos módulo Q
+        derivada = derivaPolinomio(Q)
+        _, reduzido = dividePolinomios(cofator, Q)
+        _, produto = dividePolinomios(multiplicarPolinomios(reduzido, derivada), Q)
+        w, _, _ = euclidesEstendido(apara(produto), Q, exato=exato)
+        _, inverso = dividePolinomios(multiplicarPolinomios(w, derivada), Q)
+        _, inverso_derivada = dividePolinomios(multiplicarPolinomios(w, reduzido), Q)
+        
+        # Numerador sobre Q^e, A·cofator⁻¹ mod Q^e = Σ bₘ·Q^m, pelos dígitos
+        # Q-ádicos: A = b₀·cofator + Q·A₁, A₁ = b₁·cofator + Q·A₂, ... com
+        # bₘ = Aₘ·cofator⁻¹ mod Q
+        _, resto = dividePolinomios(A, potencia)
+        digitos = []
+        for m in range(e):
+            _, b = dividePolinomios(multiplicarPolinomios(inverso, resto), Q)
+            digitos.append(apara(b))
+            if m < e - 1:
+                resto, _ = dividePolinomios(subtraiPolinomios(resto, multiplicarPolinomios(digitos[-1], cofator)), Q)
+        
+        # Cada passo sobre os dígitos: t = b₀·Q'⁻¹ mod Q e b₀ - t·Q' = u·Q, de
+        # modo que s = u + Σ bₘ·Q^(m-1); todas as contas têm grau menor que o de Q
+        for j in range(e, 1, -1):
+            b = digitos.pop(0)
+            _, t = dividePolinomios(multiplicarPolinomios(inverso_derivada, b), Q)
+            t = apara(t)
+            u, _ = dividePolinomios(subtraiPolinomios(b, multiplicarPolinomios(t, derivada)), Q)
+            g = apara([-c / (j - 1) for c in t])
+            if not _ehZero(g):
+                termos.append((g, Q, j - 1))
+            digitos[0] = somaPolinomios(somaPolinomios(digitos[0], u), [c / (j - 1) for c in derivaPolinomio(t)])
+        restos.append(apara(digitos[0]))
+    
+    # ∫ Σ aᵢ/Qᵢ = ∫ R/D*, com D* = Π Qᵢ
+    D_estrela = [1]
+    for Q, _ in fatores:
+        D_estrela = multiplicarPolinomios(D_estrela, Q)
+    R = [0]
+    for (Q, _), a in zip(fatores, restos):
+        cofator, _ = dividePolinomios(D_estrela, Q)
+        R = somaPolinomios(R, multiplicarPolinomios(a, cofator))
+    
+    return termos, apara(R), D_estrela, [Q for Q, _ in fatores]
+
+
+def formataParteRacional(termos, precisao=4):
+    """Representação textual de Σ g/Q^j"""
+    return " + ".join(
+        f"({Polinomio(g).formata(precisao)})/({Polinomio(Q).formata(precisao)})" + (f"^{j}" if j > 1 else "")
+        for g, Q, j in termos
+    )
+
+
+# FÓRMULAS DE REDUÇÃO (POTÊNCIAS DE QUADRÁTICOS)
+@lru_cache(maxsize=4096)
+def coeficientesReducao(a, b, c, k):
+    """
+    Coeficientes da fórmula de redução para Iₖ = ∫ dx/(ax² + bx + c)^k:
+        Iₖ = Σⱼ αⱼ·(2ax + b)/(ax² + bx + c)^j + β·I₁   (j = 1..k-1)
+    
+    Obtidos pela recorrência (Δ = 4ac - b²):
+        Iₖ = (2ax + b)/((k-1)·Δ·q^(k-1)) + 2(2k-3)a/((k-1)·Δ)·Iₖ₋₁
+    
+    Os resultados ficam num cache LRU limitado por (a, b, c, k), e cada
+    potência reaproveita a potência anterior já calculada.
+    
+    Retorna:
+        (alfas, beta) com alfas[j-1] = αⱼ
+    """
+    if k == 1:
+        return (), 1.0
+    
+    delta = 4*a*c - b**2
+    alfas_ant, beta_ant = coeficientesReducao(a, b, c, k - 1)
+    gama = 2 * (2*k - 3) * a / ((k - 1) * delta)
+    alfas = tuple(gama * alfa for alfa in alfas_ant) + (1 / ((k - 1) * delta),)
+    return alfas, gama * beta_ant
+
+
+def formataQuadratico(a, b, c, precisao=4):
+    """Representação textual de ax² + bx + c"""
+    if abs(b) < 1e-10:
+        return f"{a:.{precisao}g}x² + {c:.{precisao}g}"
+    return f"{a:.{precisao}g}x² + {b:.{precisao}g}x + {c:.{precisao}g}"
+
+
+def integraInversoQuadratico(coef, a, b, c, precisao=4):
+    """
+    Integra coef/(ax² + bx + c) para qualquer sinal do discriminante.
+    
+    Retorna:
+        string com a integral
+    """
+    delta = b**2 - 4*a*c
+    h = b / (2*a)
+    
+    if delta < -1e-10:
+        # Completa quadrado: a(x + h)² + Δ'/(4a), com Δ' = 4ac - b²
+        raiz_delta = math.sqrt(-delta)
+        coef_arctan = 2 * coef / raiz_delta
+        escala = raiz_delta / (2*a)
+        return f"{coef_arctan:.{precisao}g}·arctan((x + {h:.{precisao}g}) / {escala:.{precisao}g})"
+    
+    if delta > 1e-10:
+        # Raízes reais: 1/(a(x - r₁)(x - r₂)) → ln|(x - r₁)/(x - r₂)|/(a(r₁ - r₂))
+        r1 = (-b + math.sqrt(delta)) / (2*a)
+        r2 = (-b - math.sqrt(delta)) / (2*a)
+        coef_ln = coef / (a * (r1 - r2))
+        return f"{coef_ln:.{precisao}g}·ln|(x - ({r1:.{precisao}g})) / (x - ({r2:.{precisao}g}))|"
+    
+    # Quadrado perfeito: a(x + h)²
+    return f"{-coef / a:.{precisao}g}/(x + {h:.{precisao}g})"
+
+
 # FUNÇÕES PRINCIPAIS
 def verificaFracao(numerador, denominador):
     """
@@ -318,10 +1239,6 @@ def verificaFracao(numerador, denominador):
     if num.grau() >= den.grau():
         return False, f"Erro: Fração imprópria (grau numerador {num.grau()} >= grau denominador {den.grau()}). Use divisão polinomial primeiro.", den_expandido
     
-    # Verifica grau do denominador (deve ser 2 ou 4 para os casos propostos)
-    if den.grau() not in [2, 4]:
-        return False, f"Erro: Grau do denominador ({den.grau()}) não suportado. Deve ser 2 ou 4.", den_expandido
-    
     # Verifica grau do numerador (deve ser no máximo 1)
     if num.grau() > 1:
         return False, f"Erro: Grau do numerador ({num.grau()}) deve ser no máximo 1 (forma Ax + B).", den_expandido
@@ -346,32 +1263,48 @@ def identificaTipoFatoracao(denominador):
         # Verifica se são todos lineares (grau 1)
         todos_lineares = all(len(f) == 2 for f in fatores)
         
-        if todos_lineares and len(fatores) == 2:
+        # Fatores repetidos não podem usar os casos de dois fatores distintos.
+        # Compara as formas mônicas (as raízes), já que fatores proporcionais
+        # como (2x-2)(x-1) também são repetidos
+        distintos = len(fatores) != 2 or len(fatores[0]) != len(fatores[1]) or any(
+            abs(a - b) > 1e-10 * (1 + abs(a))
+            for a, b in zip(_monico(Polinomio(fatores[0]).coefs), _monico(Polinomio(fatores[1]).coefs))
+        )
+        
+        if todos_lineares and len(fatores) == 2 and distintos:
             # (ax + b)(cx + d) - fatores lineares
             # Extrai as raízes de cada fator ax + b = 0 → x = -b/a
             raizes = []
-            fatores_str = []
             for fator in fatores:
                 b, a = fator[0], fator[1]
                 if abs(a) > 1e-10:
                     raiz = -b / a
                     raizes.append(raiz)
-                    fatores_str.append(f"({a:.4g}x + {b:.4g})")
             
-            return 'linear_fatorado', {
+            info = {
                 'descricao': 'Produto de fatores lineares (mantido fatorado)',
                 'raizes': raizes,
-                'fatores': fatores,
-                'fatores_str': " × ".join(fatores_str)
+                'fatores': fatores
             }
+            info['fatores_str'] = formataFatoracao('linear_fatorado', info)
+            return 'linear_fatorado', info
         
         # Se tem fatores quadráticos
         todos_quadraticos = all(len(f) == 3 for f in fatores)
-        if todos_quadraticos and len(fatores) == 2:
-            return 'misto_fatorado', {
+        forma_x2_mais_p = todos_quadraticos and all(
+            abs(f[1]) < 1e-10 and abs(f[2] - 1) < 1e-10 and f[0] > 0 for f in fatores
+        )
+        if len(fatores) == 2 and forma_x2_mais_p and distintos:
+            info = {
                 'descricao': 'Produto de fatores quadráticos (mantido fatorado)',
                 'fatores': fatores
             }
+            info['fatores_str'] = formataFatoracao('misto_fatorado', info)
+            return 'misto_fatorado', info
+        
+        # Demais casos (fatores repetidos, mais de dois fatores, fatores mistos)
+        lider, fatores_lista = fatoraFatores(fatores)
+        return 'geral', infoFatoracaoGeral(lider, fatores_lista)
     
     # Caso contrário, usa a lógica expandida original
     den = Polinomio(denominador) if isinstance(denominador, list) else Polinomio(denominador)
@@ -382,30 +1315,33 @@ def identificaTipoFatoracao(denominador):
         c, b, a = den.coefs[0], den.coefs[1] if len(den.coefs) > 1 else 0, den.coefs[2]
         delta = b**2 - 4*a*c
         
-        if delta > 0:
+        # Raiz dupla primeiro, com tolerância relativa à escala de b² e 4ac:
+        # um Δ > 0 de arredondamento daria duas raízes "distintas" iguais
+        if abs(delta) <= 1e-10 * max(b**2, abs(4*a*c)):
+            x1 = -b / (2*a)
+            tipo, info = 'linear_dupla', {
+                'descricao': 'Fator linear repetido (x - x₁)²',
+                'raizes': [x1],
+                'coeficiente_lider': a,
+                'fatores_lista': [([-x1, 1.0], 2)]
+            }
+        elif delta > 0:
             # Duas raízes reais distintas
             x1 = (-b + math.sqrt(delta)) / (2*a)
             x2 = (-b - math.sqrt(delta)) / (2*a)
-            return 'linear', {
+            tipo, info = 'linear', {
                 'descricao': 'Produto de fatores lineares (x - x₁)(x - x₂)',
                 'raizes': [x1, x2],
-                'fatores': f"({a:.4g})(x - {x1:.4g})(x - {x2:.4g})"
-            }
-        elif abs(delta) < 1e-10:
-            # Raiz dupla
-            x1 = -b / (2*a)
-            return 'linear_dupla', {
-                'descricao': 'Fator linear repetido (x - x₁)²',
-                'raizes': [x1],
-                'fatores': f"({a:.4g})(x - {x1:.4g})²"
+                'coeficiente_lider': a
             }
         else:
             # Raízes complexas
-            return 'quadratico_complexo', {
+            tipo, info = 'quadratico_complexo', {
                 'descricao': 'Quadrático irredutível (raízes complexas)',
-                'coeficientes': (a, b, c),
-                'fatores': f"{a:.4g}x² + {b:.4g}x + {c:.4g}"
+                'coeficientes': (a, b, c)
             }
+        info['fatores'] = formataFatoracao(tipo, info)
+        return tipo, info
     
     elif grau == 4:
         # Verifica se é produto de dois quadráticos (x² + x₁)(x² + x₂)
@@ -423,17 +1359,21 @@ def identificaTipoFatoracao(denominador):
                 t1 = (-b + math.sqrt(delta_t)) / (2*a)
                 t2 = (-b - math.sqrt(delta_t)) / (2*a)
                 
-                if t1 > 0 and t2 > 0:
-                    return 'misto', {
-                        'descricao': 'Produto de quadráticos (x² + x₁)(x² + x₂)',
-                        'valores': [t1, t2],
-                        'fatores': f"(x² + {t1:.4g})(x² + {t2:.4g})"
+                # a(x² - t₁)(x² - t₂) só tem fatores irredutíveis se t₁, t₂ < 0
+                if t1 < 0 and t2 < 0 and abs(t1 - t2) > 1e-10:
+                    p1, p2 = -t1, -t2
+                    info = {
+                        'descricao': 'Produto de quadráticos (x² + p₁)(x² + p₂)',
+                        'valores': [p1, p2],
+                        'coeficiente_lider': a
                     }
-        
-        return 'complexo', {
-            'descricao': 'Fatoração complexa de grau 4',
-            'fatores': str(den)
-        }
+                    info['fatores'] = formataFatoracao('misto', info)
+                    return 'misto', info
+    
+    if grau >= 1:
+        # Fatoração geral (raízes múltiplas, graus diferentes de 2 e 4)
+        lider, fatores_lista = fatoraPolinomio(den.coefs)
+        return 'geral', infoFatoracaoGeral(lider, fatores_lista)
     
     return 'desconhecido', {'descricao': 'Tipo não identificado'}
 
@@ -453,9 +1393,12 @@ def decompoeEmFracoesParciais(numerador, denominador, tipo_fatoracao, info_fator
         for i in range(1, len(fatores)):
             num_expandido = multiplicarPolinomios(num_expandido, fatores[i])
     
-    num = Polinomio(num_expandido)
-    A = num.coefs[1] if len(num.coefs) > 1 else 0
-    B = num.coefs[0]
+    # Zeros à direita relativos à escala do numerador (não à tolerância
+    # absoluta de Polinomio): com um denominador de líder grande, ou após a
+    # redução de Hermite, todos os coeficientes podem ser muito pequenos
+    num = _limpaPolinomio(num_expandido, max(abs(c) for c in num_expandido), 1e-12)
+    A = num[1] if len(num) > 1 else 0
+    B = num[0]
     
     decomposicao = []
     if tipo_fatoracao == 'linear_fatorado':
@@ -498,12 +1441,14 @@ def decompoeEmFracoesParciais(numerador, denominador, tipo_fatoracao, info_fator
     
     elif tipo_fatoracao == 'linear':
         # (Ax + B) / [(x - x₁)(x - x₂)] = A₁/(x - x₁) + A₂/(x - x₂)
+        # (com o coeficiente líder a: a(x - x₁)(x - x₂), divide A e B por a)
         x1, x2 = info_fatoracao['raizes']
+        lider = info_fatoracao['coeficiente_lider']
         
-        # Sistema: A₁ + A₂ = A
-        #         -A₁x₂ - A₂x₁ = B
+        # Sistema: A₁ + A₂ = A/a
+        #         -A₁x₂ - A₂x₁ = B/a
         matriz = [[1, 1], [-x2, -x1]]
-        vetor = [A, B]
+        vetor = [A / lider, B / lider]
         
         solucao = SistemaLinear.resolver(matriz, vetor)
         A1, A2 = solucao
@@ -524,22 +1469,24 @@ def decompoeEmFracoesParciais(numerador, denominador, tipo_fatoracao, info_fator
     elif tipo_fatoracao == 'quadratico_complexo':
         # Mantém na forma (Ax + B) / (ax² + bx + c)
         a, b, c = info_fatoracao['coeficientes']
-        decomposicao.append({
+        termo = {
             'tipo': 'quadratico',
             'numerador': (A, B),
-            'denominador': (a, b, c),
-            'forma': f"({A:.4g}x + {B:.4g}) / ({a:.4g}x² + {b:.4g}x + {c:.4g})"
-        })
+            'denominador': (a, b, c)
+        }
+        termo['forma'] = formaTermo(termo)
+        decomposicao.append(termo)
     
     elif tipo_fatoracao == 'misto':
-        # (Ax + B) / [(x² + p₁)(x² + p₂)] = (C₁x + D₁)/(x² + p₁) + (C₂x + D₂)/(x² + p₂)
+        # (Ax + B) / [a(x² + p₁)(x² + p₂)] = (C₁x + D₁)/(x² + p₁) + (C₂x + D₂)/(x² + p₂)
         p1, p2 = info_fatoracao['valores']
+        lider = info_fatoracao['coeficiente_lider']
         
         # Sistema 4x4:
         # C₁ + C₂ = 0
         # D₁ + D₂ = 0
-        # p₂C₁ + p₁C₂ = A
-        # p₂D₁ + p₁D₂ = B
+        # p₂C₁ + p₁C₂ = A/a
+        # p₂D₁ + p₁D₂ = B/a
         
         matriz = [
             [1, 0, 1, 0],
@@ -547,7 +1494,7 @@ def decompoeEmFracoesParciais(numerador, denominador, tipo_fatoracao, info_fator
             [p2, 0, p1, 0],
             [0, p2, 0, p1]
         ]
-        vetor = [0, 0, A, B]
+        vetor = [0, 0, A / lider, B / lider]
         
         solucao = SistemaLinear.resolver(matriz, vetor)
         C1, D1, C2, D2 = solucao
@@ -604,10 +1551,22 @@ def decompoeEmFracoesParciais(numerador, denominador, tipo_fatoracao, info_fator
             'forma': f"({C2:.4g}x + {D2:.4g}) / (x² + {p2:.4g})"
         })
     
+    elif tipo_fatoracao in ('linear_dupla', 'geral'):
+        # Fatores com multiplicidade: N/(lider·Π fᵢ^kᵢ)
+        # Cada fator é tratado separadamente pela série de Taylor na raiz,
+        # sem sistema linear
+        lider = info_fatoracao['coeficiente_lider']
+        fatores = info_fatoracao['fatores_lista']
+        
+        for i, (fator, mult) in enumerate(fatores):
+            outros = fatores[:i] + fatores[i + 1:]
+            for numerador_termo, potencia in coeficientesFatorRepetido(num, fator, mult, outros, lider):
+                decomposicao.append(montaTermoParcial(fator, numerador_termo, potencia))
+    
     return decomposicao
 
 
-def integraCadaTermo(termo):
+def integraCadaTermo(termo, precisao=4):
     """
     Integra um termo da decomposição.
     
@@ -620,9 +1579,21 @@ def integraCadaTermo(termo):
         x0 = termo['raiz']
         
         if abs(x0) < 1e-10:
-            return f"{A:.4g}·ln|x|"
+            return f"{A:.{precisao}g}·ln|x|"
         else:
-            return f"{A:.4g}·ln|x - ({x0:.4g})|"
+            return f"{A:.{precisao}g}·ln|x - ({x0:.{precisao}g})|"
+    
+    elif termo['tipo'] == 'linear_repetido':
+        # ∫ A/(x - x₀)^k dx = -A/((k-1)(x - x₀)^(k-1))
+        A = termo['coeficiente']
+        x0 = termo['raiz']
+        k = termo['potencia']
+        
+        coef_integral = -A / (k - 1)
+        base = "x" if abs(x0) < 1e-10 else f"(x - ({x0:.{precisao}g}))"
+        if k - 1 == 1:
+            return f"{coef_integral:.{precisao}g}/{base}"
+        return f"{coef_integral:.{precisao}g}/{base}^{k - 1}"
     
     elif termo['tipo'] == 'linear_geral':
         # ∫ A/(ax + b) dx = (A/a)·ln|ax + b|
@@ -635,9 +1606,9 @@ def integraCadaTermo(termo):
         coef_integral = A / a
         
         if abs(b) < 1e-10:
-            return f"{coef_integral:.4g}·ln|{a:.4g}x|"
+            return f"{coef_integral:.{precisao}g}·ln|{a:.{precisao}g}x|"
         else:
-            return f"{coef_integral:.4g}·ln|{a:.4g}x + {b:.4g}|"
+            return f"{coef_integral:.{precisao}g}·ln|{a:.{precisao}g}x + {b:.{precisao}g}|"
     
     elif termo['tipo'] == 'quadratico':
         # ∫ (Cx + D)/(ax² + bx + c) dx
@@ -645,119 +1616,1708 @@ def integraCadaTermo(termo):
         a, b, c = termo['denominador']
         
         partes = []
+        # Coeficientes desprezíveis em relação ao termo (não em valor
+        # absoluto: com denominadores de líder grande, C e D são pequenos)
+        D_ajustado = D - C * b / (2*a)
+        tol = 1e-12 * max(abs(C), abs(D_ajustado))
         
         # Parte 1: termo com derivada (se C ≠ 0)
-        if abs(C) > 1e-10:
+        if abs(C) > tol:
             # ∫ C·x/(ax² + bx + c) dx relacionado com ∫ (2ax + b)/(ax² + bx + c) dx
             coef_ln = C / (2*a)
             if abs(b) < 1e-10:
-                partes.append(f"{coef_ln:.4g}·ln|{a:.4g}x² + {c:.4g}|")
+                partes.append(f"{coef_ln:.{precisao}g}·ln|{a:.{precisao}g}x² + {c:.{precisao}g}|")
             else:
-                partes.append(f"{coef_ln:.4g}·ln|{a:.4g}x² + {b:.4g}x + {c:.4g}|")
+                partes.append(f"{coef_ln:.{precisao}g}·ln|{a:.{precisao}g}x² + {b:.{precisao}g}x + {c:.{precisao}g}|")
         
-        # Parte 2: termo arctg (relacionado com a parte constante ajustada)
-        delta = b**2 - 4*a*c
+        # Parte 2: termo arctg (ou ln/racional se o discriminante não for negativo)
+        if abs(D_ajustado) > tol:
+            partes.append(integraInversoQuadratico(D_ajustado, a, b, c, precisao))
         
-        if delta < 0:  # Raízes complexas
-            # Completa quadrado: a(x + b/(2a))² + (c - b²/(4a))
-            h = b / (2*a)
-            k = (4*a*c - b**2) / (4*a)
-            
-            # Ajuste no numerador constante
-            D_ajustado = D - C * b / (2*a)
-            
-            if abs(D_ajustado) > 1e-10 and abs(k) > 1e-10:
-                coef_arctan = D_ajustado / (math.sqrt(a * k))
-                arg = f"(x + {h:.4g}) / {math.sqrt(k/a):.4g}"
-                partes.append(f"{coef_arctan:.4g}·arctan({arg})")
+        return " + ".join(partes) if partes else "0"
+    
+    elif termo['tipo'] == 'quadratico_repetido':
+        # ∫ (Cx + D)/(ax² + bx + c)^k dx, k > 1
+        # = C/(2a)·∫ (2ax + b)/q^k dx + (D - Cb/(2a))·∫ dx/q^k
+        C, D = termo['numerador']
+        a, b, c = termo['denominador']
+        k = termo['potencia']
+        quadratico = formataQuadratico(a, b, c, precisao)
+        
+        partes = []
+        D_ajustado = D - C * b / (2*a)
+        tol = 1e-12 * max(abs(C), abs(D_ajustado))
+        
+        # Parte 1: ∫ (2ax + b)/q^k dx = -1/((k-1)·q^(k-1))
+        if abs(C) > tol:
+            coef_racional = -C / (2*a * (k - 1))
+            expoente = "" if k - 1 == 1 else f"^{k - 1}"
+            partes.append(f"{coef_racional:.{precisao}g}/({quadratico}){expoente}")
+        
+        # Parte 2: ∫ dx/q^k pela fórmula de redução
+        if abs(D_ajustado) > tol:
+            if abs(4*a*c - b**2) < 1e-10:
+                # q = a(x + h)²: ∫ dx/q^k = -1/(a^k·(2k-1)·(x + h)^(2k-1))
+                h = b / (2*a)
+                coef_racional = -D_ajustado / (a**k * (2*k - 1))
+                partes.append(f"{coef_racional:.{precisao}g}/(x + {h:.{precisao}g})^{2*k - 1}")
+            else:
+                alfas, beta = coeficientesReducao(a, b, c, k)
+                for j, alfa in enumerate(alfas, 1):
+                    expoente = "" if j == 1 else f"^{j}"
+                    partes.append(f"{D_ajustado * alfa:.{precisao}g}·({2*a:.{precisao}g}x + {b:.{precisao}g})/({quadratico}){expoente}")
+                partes.append(integraInversoQuadratico(D_ajustado * beta, a, b, c, precisao))
         
         return " + ".join(partes) if partes else "0"
     
     return "termo não reconhecido"
 
 
-def calculaIntegral(numerador, denominador):
+def novoResultado():
     """
-    Função principal que calcula a integral completa.
-    Coordena todas as etapas do processo.
-    
-    Retorna:
-        dicionário com todos os passos e resultado
+    Dicionário de resultado vazio, com todos os campos preenchidos pelas etapas.
     """
-    resultado = {
+    return {
         'valido': False,
         'mensagem_validacao': '',
+        'fracao': None,
         'tipo_fatoracao': '',
         'info_fatoracao': {},
+        'fator_cancelado': '',
+        'fator_comum': None,
+        'parte_racional': '',
+        'parte_racional_termos': [],
         'decomposicao': [],
         'integrais_parciais': [],
         'resultado_final': ''
     }
+
+
+# ETAPAS DO CÁLCULO
+# Cada etapa recebe e devolve um item {'numerador', 'denominador', 'hermite',
+# 'resultado', ...}, de modo que possam ser encadeadas em calculaIntegral ou
+# executadas separadamente no pipeline em lotes.
+def etapaValidacao(item):
+    """Passos 0 e 1: cancela fatores comuns e valida a fração"""
+    resultado = item['resultado']
+    
+    # Passo 0: Cancelar fatores comuns (MDC exato)
+    numerador, denominador, fator_comum = simplificaFracao(item['numerador'], item['denominador'])
+    if fator_comum is not None:
+        resultado['fator_cancelado'] = str(Polinomio(fator_comum))
+        resultado['fator_comum'] = Polinomio(fator_comum).coefs
     
     # Passo 1: Verificar se a fração é válida
     valido, mensagem, den_expandido = verificaFracao(numerador, denominador)
     resultado['valido'] = valido
     resultado['mensagem_validacao'] = mensagem
+    if valido:
+        resultado['fracao'] = (expandePolinomio(numerador), den_expandido)
     
-    if not valido:
-        return resultado
+    item['numerador'], item['denominador'] = numerador, denominador
+    return item
+
+
+def etapaClassificacao(item):
+    """Passos 1.5 e 2: redução de Hermite (opcional) e tipo de fatoração"""
+    resultado = item['resultado']
+    if not resultado['valido']:
+        return item
+    
+    numerador, denominador = item['numerador'], item['denominador']
+    partes_livres = None
+    
+    # Passo 1.5 (opcional): Redução de Hermite
+    if item.get('hermite'):
+        termos, R, den_livre, partes = reducaoHermite(numerador, denominador)
+        if termos:
+            termos = [([float(c) for c in g], [float(c) for c in Q], j) for g, Q, j in termos]
+            resultado['parte_racional'] = formataParteRacional(termos)
+            resultado['parte_racional_termos'] = termos
+            # D* já é mônico: os casos de grau 2 e 4 partem das raízes do
+            # denominador
+            R = [float(c) for c in R]
+            numerador = _limpaPolinomio(R, max(abs(c) for c in R), 1e-12)
+            denominador = Polinomio([float(c) for c in den_livre]).coefs
+            # Numerador restante de grau ≥ 2 (só o caso geral o comporta) ou
+            # D* fora dos casos especiais de grau 2 e 4: fatora cada Qᵢ da
+            # decomposição livre de quadrados em separado
+            if len(expandePolinomio(numerador)) > 2 or len(denominador) not in (3, 5):
+                partes_livres = [[float(c) for c in Q] for Q in partes]
     
     # Passo 2: Identificar tipo de fatoração (usa denominador original se fatorado)
-    tipo, info = identificaTipoFatoracao(denominador)
+    if partes_livres is not None:
+        lider, fatores_lista = fatoraFatores(partes_livres)
+        tipo, info = 'geral', infoFatoracaoGeral(lider, fatores_lista)
+    else:
+        tipo, info = identificaTipoFatoracao(denominador)
     resultado['tipo_fatoracao'] = tipo
     resultado['info_fatoracao'] = info
     
-    # Passo 3: Decompor em frações parciais
-    decomp = decompoeEmFracoesParciais(numerador, denominador, tipo, info)
+    item['numerador'], item['denominador'] = numerador, denominador
+    return item
+
+
+def etapaDecomposicao(item):
+    """Passo 3: decompõe em frações parciais"""
+    resultado = item['resultado']
+    if not resultado['valido']:
+        return item
+    
+    numerador, denominador = item['numerador'], item['denominador']
+    if _ehZero(expandePolinomio(numerador)):
+        decomp = []
+    else:
+        decomp = decompoeEmFracoesParciais(numerador, denominador,
+                                           resultado['tipo_fatoracao'], resultado['info_fatoracao'])
     resultado['decomposicao'] = decomp
+    return item
+
+
+def etapaIntegracao(item):
+    """Passos 4 e 5: integra cada termo e monta o resultado final"""
+    resultado = item['resultado']
+    if not resultado['valido']:
+        return item
     
     # Passo 4: Integrar cada termo
     integrais = []
-    for termo in decomp:
+    for termo in termosNaoNulos(resultado['decomposicao']):
         integral = integraCadaTermo(termo)
         integrais.append(integral)
     resultado['integrais_parciais'] = integrais
     
     # Passo 5: Montar resultado final
-    if integrais:
-        resultado['resultado_final'] = " + ".join(integrais) + " + C"
+    partes = [resultado['parte_racional']] if resultado['parte_racional'] else []
+    partes += integrais
+    if partes:
+        resultado['resultado_final'] = " + ".join(partes) + " + C"
     else:
         resultado['resultado_final'] = "C"
     
-    return resultado
+    return item
 
 
-def imprimeResultado(resultado):
+def calculaIntegral(numerador, denominador, hermite=False):
     """
-    Imprime o resultado de forma formatada e organizada.
+    Função principal que calcula a integral completa.
+    Coordena todas as etapas do processo.
+    
+    Parâmetros:
+        hermite: se True, separa antes a parte racional pela redução de
+                 Hermite, e só o denominador livre de quadrados é fatorado
+    
+    Retorna:
+        dicionário com todos os passos e resultado
     """
-    print("\n" + "="*70)
-    print("RESULTADO DA INTEGRAÇÃO POR FRAÇÕES PARCIAIS")
-    print("="*70)
+    item = {
+        'numerador': numerador,
+        'denominador': denominador,
+        'hermite': hermite,
+        'resultado': novoResultado()
+    }
     
-    print(f"\n1. VALIDAÇÃO: {resultado['mensagem_validacao']}")
+    for etapa in (etapaValidacao, etapaClassificacao, etapaDecomposicao, etapaIntegracao):
+        etapa(item)
     
-    if not resultado['valido']:
-        return
+    return item['resultado']
+
+
+def imprimeResultado(resultado, precisao=4):
+    """
+    Imprime o resultado de forma formatada e organizada.
+    A saída é montada em memória e gravada de uma vez (ver renderizaTexto).
+    """
+    with EscritorBuffer() as escritor:
+        renderizaTexto(resultado, escritor, precisao)
+
+
+# AVALIADORES COMPILADOS
+def _acumulaTermo(termo, lineares, quadraticos):
+    """
+    Soma as contribuições da integral do termo (mesmas fórmulas de
+    integraCadaTermo) nos acumuladores agrupados por fator:
+        lineares[(a, b)]: ln|ax + b| e potências 1/(ax + b)^j
+        quadraticos[(a, b, c)]: ln|q|, arctan, 1/q^j e (2ax + b)/q^j
+    """
+    def linear(a, b):
+        return lineares.setdefault((a, b), {'ln': 0.0, 'racional': {}})
+
+    def quadratico(a, b, c):
+        return quadraticos.setdefault((a, b, c), {'ln': 0.0, 'atan': 0.0, 'racional': {}, 'derivada': {}})
+
+    def inversoQuadratico(coef, a, b, c):
+        # Mesmos casos de integraInversoQuadratico
+        delta = b**2 - 4*a*c
+        if delta < -1e-10:
+            quadratico(a, b, c)['atan'] += coef
+        elif delta > 1e-10:
+            r1 = (-b + math.sqrt(delta)) / (2*a)
+            r2 = (-b - math.sqrt(delta)) / (2*a)
+            coef_ln = coef / (a * (r1 - r2))
+            linear(1.0, -r1)['ln'] += coef_ln
+            linear(1.0, -r2)['ln'] -= coef_ln
+        else:
+            grupo = linear(1.0, b / (2*a))['racional']
+            grupo[1] = grupo.get(1, 0.0) - coef / a
+
+    tipo = termo['tipo']
+    if tipo == 'linear':
+        linear(1.0, -termo['raiz'])['ln'] += termo['coeficiente']
+
+    elif tipo == 'linear_geral':
+        b, a = termo['fator'][0], termo['fator'][1]
+        linear(a, b)['ln'] += termo['coeficiente'] / a
+
+    elif tipo == 'linear_repetido':
+        k = termo['potencia']
+        grupo = linear(1.0, -termo['raiz'])['racional']
+        grupo[k - 1] = grupo.get(k - 1, 0.0) - termo['coeficiente'] / (k - 1)
+
+    elif tipo in ('quadratico', 'quadratico_repetido'):
+        C, D = termo['numerador']
+        a, b, c = termo['denominador']
+        k = termo.get('potencia', 1)
+        D_ajustado = D - C * b / (2*a)
+
+        if k == 1:
+            quadratico(a, b, c)['ln'] += C / (2*a)
+            inversoQuadratico(D_ajustado, a, b, c)
+        else:
+            grupo = quadratico(a, b, c)['racional']
+            grupo[k - 1] = grupo.get(k - 1, 0.0) - C / (2*a * (k - 1))
+            if abs(4*a*c - b**2) < 1e-10:
+                grupo = linear(1.0, b / (2*a))['racional']
+                grupo[2*k - 1] = grupo.get(2*k - 1, 0.0) - D_ajustado / (a**k * (2*k - 1))
+            else:
+                alfas, beta = coeficientesReducao(a, b, c, k)
+                grupo = quadratico(a, b, c)['derivada']
+                for j, alfa in enumerate(alfas, 1):
+                    grupo[j] = grupo.get(j, 0.0) + D_ajustado * alfa
+                inversoQuadratico(D_ajustado * beta, a, b, c)
+
+
+def _hornerFonte(coefs, variavel):
+    """
+    Expressão de Horner para Σ coefs[i]·variavel^i (cada coeficiente é um
+    número ou o nome de um parâmetro)
+    """
+    def fonte(c):
+        return c if isinstance(c, str) else repr(float(c))
+
+    expressao = fonte(coefs[-1])
+    for c in reversed(coefs[:-1]):
+        expressao = f"({expressao})*{variavel} + {fonte(c)}"
+    return expressao
+
+
+def geraFonteAntiderivada(decomposicao, parte_racional=None):
+    """
+    Gera o código-fonte Python de uma fábrica de F(x) para a decomposição,
+    com os termos que compartilham o mesmo fator agrupados (cada ln|q|,
+    arctan e 1/q é avaliado uma única vez). As constantes que só dependem
+    do denominador ficam no código; as que dependem do numerador viram
+    parâmetros k0, k1, ... da fábrica, de modo que numeradores diferentes
+    sobre o mesmo denominador geram o mesmo código.
+
+    Retorna:
+        (fonte, constantes): fonte define fabrica(k0, k1, ...) → F, e
+        fabrica(*constantes) é a antiderivada
+    """
+    lineares = {}
+    quadraticos = {}
+    for termo in decomposicao:
+        _acumulaTermo(termo, lineares, quadraticos)
+
+    constantes = []
+
+    def parametro(valor):
+        constantes.append(float(valor))
+        return f"k{len(constantes) - 1}"
+
+    linhas = []
+    parcelas = []
+
+    for i, ((a, b), grupo) in enumerate(lineares.items()):
+        linhas.append(f"u{i} = {a!r}*x + {b!r}")
+        if grupo['ln']:
+            parcelas.append(f"{parametro(grupo['ln'])}*log(abs(u{i}))")
+        if grupo['racional']:
+            # Σ cⱼ/u^j = v·(c₁ + v·(c₂ + ...)), v = 1/u
+            potencias = [0.0] * (max(grupo['racional']) + 1)
+            for j, coef in sorted(grupo['racional'].items()):
+                potencias[j] = parametro(coef)
+            linhas.append(f"v{i} = 1.0/u{i}")
+            parcelas.append(f"({_hornerFonte(potencias, f'v{i}')})")
+
+    for i, ((a, b, c), grupo) in enumerate(quadraticos.items()):
+        linhas.append(f"q{i} = ({a!r}*x + {b!r})*x + {c!r}")
+        if grupo['ln']:
+            parcelas.append(f"{parametro(grupo['ln'])}*log(abs(q{i}))")
+        if grupo['atan']:
+            # coef·2/√Δ'·arctan((2ax + b)/√Δ'), Δ' = 4ac - b²
+            raiz_delta = math.sqrt(4*a*c - b**2)
+            parcelas.append(
+                f"{parametro(2 * grupo['atan'] / raiz_delta)}*atan({2*a / raiz_delta!r}*x + {b / raiz_delta!r})"
+            )
+        if grupo['racional'] or grupo['derivada']:
+            # Σ (rⱼ + dⱼ·(2ax + b))/q^j em Horner na variável 1/q
+            grau = max(list(grupo['racional']) + list(grupo['derivada']))
+            linhas.append(f"w{i} = 1.0/q{i}")
+            linhas.append(f"t{i} = {2*a!r}*x + {b!r}")
+            expressao = "0.0"
+            for j in range(grau, 0, -1):
+                r = parametro(grupo['racional'].get(j, 0.0))
+                d = parametro(grupo['derivada'].get(j, 0.0))
+                expressao = f"({expressao} + {r} + {d}*t{i})*w{i}"
+            parcelas.append(expressao)
+
+    if parte_racional:
+        # Σ g/Q^j em Horner na variável 1/Q, um grupo por Q
+        grupos = {}
+        for g, Q, j in parte_racional:
+            grupos.setdefault(tuple(Q), {})[j] = g
+        for i, (Q, numeradores) in enumerate(grupos.items()):
+            linhas.append(f"z{i} = 1.0/({_hornerFonte(list(Q), 'x')})")
+            expressao = "0.0"
+            for j in range(max(numeradores), 0, -1):
+                g = numeradores.get(j)
+                soma = f" + {_hornerFonte([parametro(c) for c in g], 'x')}" if g else ""
+                expressao = f"({expressao}{soma})*z{i}"
+            parcelas.append(expressao)
+
+    linhas.append("return " + (" + ".join(parcelas) if parcelas else "0.0"))
+    fonte = (
+        f"def fabrica({', '.join(f'k{n}' for n in range(len(constantes)))}):\n"
+        "    def F(x):\n"
+        + "".join(f"        {linha}\n" for linha in linhas)
+        + "    return F\n"
+    )
+    return fonte, constantes
+
+
+@lru_cache(maxsize=256)
+def _compilaFabrica(fonte):
+    """Compila a fábrica de F(x); o cache LRU é indexado pelo código gerado"""
+    ambiente = {'log': math.log, 'atan': math.atan, 'abs': abs}
+    exec(compile(fonte, '<antiderivada>', 'exec'), ambiente)
+    return ambiente['fabrica']
+
+
+def compilaAntiderivada(decomposicao, parte_racional=None):
+    """
+    Compila a antiderivada da decomposição numa função Python F(x)
+    especializada, sem consultas a dicionários nem despacho por tipo.
+    O código compilado fica num cache LRU limitado, indexado pela
+    estrutura do denominador: numeradores diferentes (como numa varredura
+    da SessaoIntegral) reaproveitam o mesmo código e só trocam as
+    constantes.
+
+    Parâmetros:
+        decomposicao: lista de termos (resultado['decomposicao'])
+        parte_racional: termos [(g, Q, j), ...] da redução de Hermite, se houver
+                        (resultado['parte_racional_termos'])
+
+    Exemplo:
+        resultado = calculaIntegral(parsePolinomio("3x + 5"), parsePolinomio("(x-1)(x-2)"))
+        F = compilaAntiderivada(resultado['decomposicao'])
+        F(3.0) - F(2.5)  # integral definida
+
+    Retorna:
+        função F(x) (o código gerado fica em F.fonte e as constantes em
+        F.constantes)
+    """
+    fonte, constantes = geraFonteAntiderivada(decomposicao, parte_racional)
+    F = _compilaFabrica(fonte)(*constantes)
+    F.fonte = fonte
+    F.constantes = constantes
+    return F
+
+
+# SESSÃO INCREMENTAL
+class SessaoIntegral:
+    """
+    Recalcula integrais reaproveitando o trabalho do último denominador.
     
-    print(f"\n2. TIPO DE FATORAÇÃO: {resultado['tipo_fatoracao'].upper()}")
-    print(f"   Descrição: {resultado['info_fatoracao']['descricao']}")
-    if 'fatores_str' in resultado['info_fatoracao']:
-        print(f"   Fatores: {resultado['info_fatoracao']['fatores_str']}")
-    else:
-        print(f"   Fatores: {resultado['info_fatoracao']['fatores']}")
+    A decomposição em frações parciais é linear no numerador: com as
+    decomposições de 1/Q e x/Q guardadas, qualquer (Ax + B)/Q sai por
+    superposição A·(x/Q) + B·(1/Q), sem nova fatoração nem sistema linear.
     
-    print(f"\n3. DECOMPOSIÇÃO EM FRAÇÕES PARCIAIS:")
-    for i, termo in enumerate(resultado['decomposicao'], 1):
-        print(f"   Termo {i}: {termo['forma']}")
+    Exemplo:
+        sessao = SessaoIntegral()
+        for A in range(10):
+            resultado = sessao.calcula([1, A], parsePolinomio("(x-1)(x-2)"))
+    """
+    
+    def __init__(self):
+        self.chave_denominador = None
+        self.den_expandido = None
+        self.tipo = None
+        self.info = None
+        self.base = []
+        self.preparacoes = 0
+        self.superposicoes = 0
+    
+    def _preparaDenominador(self, denominador):
+        """Fatora o denominador e decompõe as frações da base, se mudou"""
+        chave = repr(denominador)
+        if chave == self.chave_denominador:
+            return
+        
+        self.chave_denominador = chave
+        self.den_expandido = expandePolinomio(denominador)
+        self.tipo, self.info = identificaTipoFatoracao(denominador)
+        
+        # Base de numeradores: 1 e x (numerador de grau no máximo 1)
+        grau_den = Polinomio(self.den_expandido).grau()
+        self.base = [
+            decompoeEmFracoesParciais([0] * i + [1], denominador, self.tipo, self.info)
+            for i in range(min(2, grau_den))
+        ]
+        self.preparacoes += 1
     
-    print(f"\n4. INTEGRAÇÃO DE CADA TERMO:")
-    for i, integral in enumerate(resultado['integrais_parciais'], 1):
-        print(f"   ∫ Termo {i} dx = {integral}")
+    def _temFatorComum(self, num):
+        """O numerador Ax + B tem fator comum com Q se Q(-B/A) = 0"""
+        if len(num) < 2 or abs(num[1]) < 1e-10:
+            return False
+        raiz = -num[0] / num[1]
+        escala = max(abs(c) for c in self.den_expandido)
+        return abs(avaliaPolinomio(self.den_expandido, raiz)) < 1e-9 * escala * max(1, abs(raiz)) ** (len(self.den_expandido) - 1)
     
-    print(f"\n5. RESULTADO FINAL:")
-    print(f"   ∫ f(x) dx = {resultado['resultado_final']}")
-    print("\n" + "="*70 + "\n")
+    def calcula(self, numerador, denominador):
+        """
+        Equivalente a calculaIntegral(numerador, denominador), recalculando
+        apenas a parte que depende do numerador.
+        
+        Retorna:
+            dicionário no mesmo formato de calculaIntegral
+        """
+        self._preparaDenominador(denominador)
+        num = Polinomio(expandePolinomio(numerador)).coefs
+        
+        # Fator comum com o denominador ou denominador zero: caminho completo
+        if not self.base or self._temFatorComum(num):
+            return calculaIntegral(numerador, denominador)
+        
+        resultado = novoResultado()
+        
+        valido, mensagem, _ = verificaFracao(num, self.den_expandido)
+        resultado['valido'] = valido
+        resultado['mensagem_validacao'] = mensagem
+        
+        if not valido:
+            return resultado
+        resultado['fracao'] = (num, self.den_expandido)
+        
+        resultado['tipo_fatoracao'] = self.tipo
+        resultado['info_fatoracao'] = self.info
+        
+        # Superposição: termo = Σ coef_i · termo_base_i
+        pesos = num + [0] * (len(self.base) - len(num))
+        decomp = []
+        if not _ehZero(num):
+            for termos in zip(*self.base):
+                termo = dict(termos[0])
+                if 'coeficiente' in termo:
+                    termo['coeficiente'] = sum(p * t['coeficiente'] for p, t in zip(pesos, termos))
+                if 'numerador' in termo:
+                    termo['numerador'] = tuple(
+                        sum(p * t['numerador'][i] for p, t in zip(pesos, termos))
+                        for i in range(2)
+                    )
+                termo['forma'] = formaTermo(termo)
+                decomp.append(termo)
+        resultado['decomposicao'] = decomp
+        self.superposicoes += 1
+        
+        integrais = [integraCadaTermo(termo) for termo in termosNaoNulos(decomp)]
+        resultado['integrais_parciais'] = integrais
+        resultado['resultado_final'] = " + ".join(integrais) + " + C" if integrais else "C"
+        
+        return resultado
+
+# GERADOR ALEATÓRIO E VERIFICAÇÃO AUTOMÁTICA
+def avaliaTermo(termo, x):
+    """
+    Valor numérico de um termo da decomposição no ponto x.
+    """
+    tipo = termo['tipo']
+    k = termo.get('potencia', 1)
+
+    if tipo in ('linear', 'linear_repetido'):
+        return termo['coeficiente'] / (x - termo['raiz']) ** k
+    if tipo == 'linear_geral':
+        b, a = termo['fator'][0], termo['fator'][1]
+        return termo['coeficiente'] / (a*x + b)
+
+    C, D = termo['numerador']
+    a, b, c = termo['denominador']
+    return (C*x + D) / (a*x**2 + b*x + c) ** k
+
+
+def _formataExpandido(coefs):
+    """Polinômio de coeficientes inteiros como string sem perda de precisão"""
+    termos = []
+    for i in range(len(coefs) - 1, -1, -1):
+        c = int(round(coefs[i]))
+        if c == 0:
+            continue
+        sinal = "-" if c < 0 else ("+" if termos else "")
+        valor = "" if abs(c) == 1 and i > 0 else str(abs(c))
+        potencia = "" if i == 0 else ("x" if i == 1 else f"x^{i}")
+        termos.append(f"{sinal}{valor}{potencia}")
+    return "".join(termos) if termos else "0"
+
+
+def geraFracaoAleatoria(rng, lineares=1, repetidos=1, quadraticos=1, quadraticos_repetidos=0,
+                        multiplicidade_max=3, grau_max=None, forma='aleatoria', proximos=0):
+    """
+    Gera uma fração racional (Ax + B)/Q aleatória com estrutura controlada.
+    Os fatores lineares podem ser não mônicos (ax - r), os quadráticos
+    podem vir multiplicados por um escalar e Q tem um coeficiente líder
+    aleatório.
+
+    Parâmetros:
+        rng: instância de random.Random
+        lineares: quantidade de fatores lineares simples (ax - r)
+        repetidos: quantidade de fatores lineares (ax - r)^k, 2 ≤ k ≤ multiplicidade_max
+        quadraticos: quantidade de quadráticos irredutíveis simples
+        quadraticos_repetidos: quantidade de quadráticos irredutíveis repetidos
+        proximos: quantidade de pares de raízes quase coincidentes
+                  (x - r)(mx - mr - 1), com distância 1/m, m = 100 ou 1000
+        grau_max: se informado, remove fatores até o grau de Q caber no limite
+        forma: 'fatorada', 'expandida' ou 'aleatoria'
+
+    Retorna:
+        (numerador_str, denominador_str, estrutura) com estrutura = [(fator, k), ...];
+        o coeficiente líder de Q entra como um fator constante
+    """
+    raizes = rng.sample(range(-9, 10), lineares + repetidos + proximos)
+    centros = rng.sample([(p, q) for p in range(-5, 6) for q in range(1, 5)],
+                         quadraticos + quadraticos_repetidos)
+
+    estrutura = []
+    for i, r in enumerate(raizes):
+        if i >= lineares + repetidos:
+            m = rng.choice([100, 1000])
+            estrutura.append(([-r, 1], 1))
+            estrutura.append(([-(m*r + 1), m], 1))
+            continue
+        k = 1 if i < lineares else rng.randint(2, multiplicidade_max)
+        a = rng.choice([1, 1, 2, 3])
+        estrutura.append(([-r, a], k))
+    for i, (p, q) in enumerate(centros):
+        # s·((x - p)² + q²) = s·(x² - 2px + p² + q²)
+        k = 1 if i < quadraticos else rng.randint(2, multiplicidade_max)
+        s = rng.choice([1, 1, 2, 5])
+        estrutura.append(([s*(p**2 + q**2), -2*s*p, s], k))
+    rng.shuffle(estrutura)
+
+    if grau_max is not None:
+        while estrutura and sum((len(f) - 1) * k for f, k in estrutura) > grau_max:
+            fator, k = estrutura.pop()
+            if k > 1:
+                estrutura.append((fator, k - 1))
+    if not estrutura:
+        estrutura = [([-rng.randint(-9, 9), 1], 1)]
+
+    grau = sum((len(f) - 1) * k for f, k in estrutura)
+    A = rng.randint(-9, 9) if grau > 1 else 0
+    B = rng.randint(-9, 9)
+    if A == 0 and B == 0:
+        B = 1
+
+    lider = rng.choice([1, 1, -1, 2, 3, -4])
+    if lider != 1:
+        estrutura.insert(0, ([lider], 1))
+
+    if forma == 'aleatoria':
+        forma = rng.choice(['fatorada', 'expandida'])
+    if forma == 'fatorada':
+        denominador = "".join(
+            f"({_formataExpandido(f)})" + (f"^{k}" if k > 1 else "") for f, k in estrutura
+        )
+    else:
+        expandido = [1]
+        for f, k in estrutura:
+            for _ in range(k):
+                expandido = multiplicarPolinomios(expandido, f)
+        denominador = _formataExpandido(expandido)
+
+    return _formataExpandido([B, A]), denominador, estrutura
+
+
+def casosAleatorios(rng, quantidade, grau_max=12, multiplicidade_max=5):
+    """
+    Lista de frações de geraFracaoAleatoria com estrutura sorteada
+    (0-3 lineares, 0-2 repetidos, 0-2 quadráticos, 0-1 quadrático repetido,
+    0-1 par de raízes próximas, repetidos com multiplicidade até
+    multiplicidade_max).
+    """
+    casos = []
+    for _ in range(quantidade):
+        estrutura = {
+            'lineares': rng.randint(0, 3),
+            'repetidos': rng.randint(0, 2),
+            'quadraticos': rng.randint(0, 2),
+            'quadraticos_repetidos': rng.randint(0, 1),
+            'proximos': rng.randint(0, 1),
+        }
+        casos.append(geraFracaoAleatoria(rng, grau_max=grau_max,
+                                         multiplicidade_max=multiplicidade_max, **estrutura))
+    return casos
+
+
+def _avaliaFatorado(polinomio, x):
+    """
+    Valor do polinômio em x; na forma fatorada, multiplica os fatores sem
+    expandir (a forma expandida perde precisão perto de polos múltiplos).
+    """
+    if isinstance(polinomio, dict) and polinomio.get('fatorado'):
+        valor = 1.0
+        for fator in polinomio['fatores']:
+            valor *= avaliaPolinomio(fator, x)
+        return valor
+    return avaliaPolinomio(polinomio, x)
+
+
+def _valoresTermos(resultado, x):
+    """
+    Valores em x de cada parcela do integrando: os termos da decomposição
+    e as derivadas dos termos g/Q^j da parte racional de Hermite.
+    """
+    valores = []
+    for g, Q, j in resultado.get('parte_racional_termos') or ():
+        # (g/Q^j)' = (g'·Q - j·g·Q')/Q^(j+1)
+        q = avaliaPolinomio(Q, x)
+        valores.append((avaliaPolinomio(derivaPolinomio(g), x) * q
+                        - j * avaliaPolinomio(g, x) * avaliaPolinomio(derivaPolinomio(Q), x)) / q**(j + 1))
+    valores.extend(avaliaTermo(termo, x) for termo in resultado['decomposicao'])
+    return valores
+
+
+def _erroRelativo(obtido, esperado, valores):
+    """
+    Erro relativo à maior escala entre |esperado| e Σ|parcelas|: longe
+    dos polos as parcelas se cancelam e |N/D| fica muito menor que cada
+    uma, sem que o erro de arredondamento delas diminua.
+    """
+    escala = max(abs(esperado), sum(abs(v) for v in valores))
+    if escala == 0:
+        return abs(obtido - esperado)
+    return abs(obtido - esperado) / escala
+
+
+def verificaDecomposicao(resultado, numerador, denominador, pontos):
+    """
+    Recombina a decomposição (e a parte racional de Hermite, se houver)
+    e compara com N(x)/D(x) nos pontos dados. O denominador pode estar
+    na forma fatorada, que é avaliada fator a fator.
+
+    Retorna:
+        maior erro relativo encontrado (ver _erroRelativo)
+    """
+    num = expandePolinomio(numerador)
+
+    erro_max = 0.0
+    for x in pontos:
+        esperado = avaliaPolinomio(num, x) / _avaliaFatorado(denominador, x)
+        valores = _valoresTermos(resultado, x)
+        erro_max = max(erro_max, _erroRelativo(sum(valores), esperado, valores))
+    return erro_max
+
+
+def _extensaoComplexa(F):
+    """
+    Reexecuta o código compilado de F (F.fonte) com log, atan e abs
+    analíticos, para derivar pelo passo complexo: F'(x) ≈ Im F(x + ih)/h
+    não tem a subtração que faz a diferença finita perder dígitos quando
+    |F| ≫ |F'|·h
+    """
+    ambiente = {'log': cmath.log, 'atan': cmath.atan,
+                'abs': lambda u: u if u.real >= 0 else -u}
+    exec(compile(F.fonte, '<antiderivada>', 'exec'), ambiente)
+    return ambiente['fabrica'](*F.constantes)
+
+
+def verificaAntiderivada(F, numerador, denominador, pontos, resultado=None):
+    """
+    Compara a derivada de F pelo passo complexo (exata até o arredondamento,
+    ver _extensaoComplexa) com N(x)/D(x).
+
+    Parâmetros:
+        resultado: se informado, o erro é relativo também a Σ|parcelas|
+                   (ver _erroRelativo); senão, apenas a |N/D|
+
+    Retorna:
+        maior erro relativo encontrado
+    """
+    num = expandePolinomio(numerador)
+    G = _extensaoComplexa(F)
+    passo = 1e-20
+
+    erro_max = 0.0
+    for x in pontos:
+        esperado = avaliaPolinomio(num, x) / _avaliaFatorado(denominador, x)
+        obtido = G(complex(x, passo)).imag / passo
+        valores = _valoresTermos(resultado, x) if resultado is not None else []
+        erro_max = max(erro_max, _erroRelativo(obtido, esperado, valores))
+    return erro_max
+
+
+def _pontosAmostra(rng, estrutura, quantidade):
+    """Pontos aleatórios em [-10, 10] afastados dos polos reais"""
+    polos = [-f[0] / f[1] for f, _ in estrutura if len(f) == 2]
+    pontos = []
+    while len(pontos) < quantidade:
+        x = rng.uniform(-10, 10)
+        if all(abs(x - r) > 0.25 for r in polos):
+            pontos.append(x)
+    return pontos
+
+
+def executarVerificacao(quantidade=200, semente=0, grau_max=12, multiplicidade_max=5,
+                        hermite=False, compilado=True, tol=1e-6, imprimir=True):
+    """
+    Verificação automática (sem interação): gera frações aleatórias,
+    resolve cada uma e confere a decomposição por recombinação em pontos
+    aleatórios (e, opcionalmente, a antiderivada compilada pela derivada
+    numérica). Mede também a vazão de calculaIntegral.
+
+    Parâmetros:
+        grau_max: grau máximo do denominador
+        multiplicidade_max: multiplicidade máxima dos fatores repetidos
+
+    Retorna:
+        dicionário com 'total', 'falhas', 'erro_maximo' e 'integrais_por_segundo'
+    """
+    rng = random.Random(semente)
+    casos = casosAleatorios(rng, quantidade, grau_max, multiplicidade_max)
+
+    entradas = [(parsePolinomio(n), parsePolinomio(d)) for n, d, _ in casos]
+
+    inicio = time.perf_counter()
+    resultados = [calculaIntegral(num, den, hermite=hermite) for num, den in entradas]
+    duracao = time.perf_counter() - inicio
+
+    falhas = []
+    erro_maximo = 0.0
+    for (n, d, estrutura), (num, den), resultado in zip(casos, entradas, resultados):
+        if not resultado['valido']:
+            falhas.append((n, d, resultado['mensagem_validacao']))
+            continue
+
+        # Valor esperado pela estrutura gerada (fator a fator, sem expandir)
+        fatorado = {'fatorado': True, 'fatores': [f for f, k in estrutura for _ in range(k)]}
+        pontos = _pontosAmostra(rng, estrutura, 5)
+        erro = verificaDecomposicao(resultado, num, fatorado, pontos)
+        if compilado:
+            F = compilaAntiderivada(resultado['decomposicao'], resultado['parte_racional_termos'])
+            erro = max(erro, verificaAntiderivada(F, num, fatorado, pontos, resultado))
+
+        erro_maximo = max(erro_maximo, erro)
+        if erro > tol:
+            falhas.append((n, d, f"erro relativo {erro:.3g}"))
+
+    relatorio = {
+        'total': quantidade,
+        'falhas': falhas,
+        'erro_maximo': erro_maximo,
+        'integrais_por_segundo': quantidade / duracao if duracao > 0 else float('inf')
+    }
+
+    if imprimir:
+        print("\n" + "="*70)
+        print("VERIFICAÇÃO AUTOMÁTICA COM FRAÇÕES ALEATÓRIAS")
+        print("="*70)
+        print(f"Casos: {quantidade} (semente {semente}, grau máximo {grau_max}, "
+              f"multiplicidade máxima {multiplicidade_max}, hermite={hermite})")
+        print(f"Falhas: {len(falhas)}")
+        for n, d, motivo in falhas[:10]:
+            print(f"   ({n}) / ({d}): {motivo}")
+        print(f"Maior erro relativo: {erro_maximo:.3g}")
+        print(f"Vazão: {relatorio['integrais_por_segundo']:.1f} integrais/s")
+        print("="*70 + "\n")
+
+    return relatorio
+
+
+# FORMA CANÔNICA E RESOLUÇÃO EM LOTE
+def formaCanonica(numerador, denominador):
+    """
+    Normaliza a fração para uma forma canônica: ambos expandidos, com
+    coeficientes exatos (Fraction, sem arredondamento) e denominador mônico, o que cancela
+    fatores de escala comuns. Grafias diferentes da mesma fração, como
+    (x-1)(x-2) e x^2-3x+2, ou 2x/(2x^2+2) e x/(x^2+1), ficam iguais.
+
+    Retorna:
+        (numerador_canonico, denominador_canonico, chave) — a chave é um
+        hash estável (SHA-1) da forma canônica
+    """
+    num = paraFracoes(expandePolinomio(numerador))
+    den = paraFracoes(expandePolinomio(denominador))
+
+    if not _ehZero(den):
+        lider = den[-1]
+        num = [c / lider for c in num]
+        den = [c / lider for c in den]
+
+    texto = "|".join(",".join(str(c) for c in p) for p in (num, den))
+    chave = hashlib.sha1(texto.encode()).hexdigest()
+    return num, den, chave
+
+
+def calculaLote(entradas, hermite=False):
+    """
+    Resolve um lote de integrais, resolvendo cada fração canônica distinta
+    uma única vez (a partir da entrada da primeira linha do grupo, e não da
+    forma canônica) e repassando uma cópia independente do resultado a
+    todas as linhas equivalentes.
+
+    Parâmetros:
+        entradas: lista de (numerador_str, denominador_str)
+
+    Retorna:
+        lista de resultados (formato de calculaIntegral, mais a
+        'chave_canonica'), na ordem das entradas; uma entrada que não pode
+        ser lida ou resolvida vira um resultado inválido com a mensagem
+        de erro, sem interromper o lote
+    """
+    resultados = [None] * len(entradas)
+    grupos = {}
+
+    for i, (numerador_str, denominador_str) in enumerate(entradas):
+        try:
+            numerador = parsePolinomio(numerador_str)
+            denominador = parsePolinomio(denominador_str)
+            _, _, chave = formaCanonica(numerador, denominador)
+        except Exception as e:
+            resultado = novoResultado()
+            resultado['mensagem_validacao'] = f"Erro ao processar entrada: {e}"
+            resultados[i] = resultado
+            continue
+        grupos.setdefault(chave, (numerador, denominador, []))[2].append(i)
+
+    for chave, (numerador, denominador, linhas) in grupos.items():
+        try:
+            resultado = calculaIntegral(numerador, denominador, hermite=hermite)
+        except Exception as e:
+            # Como em _processaLote: o erro fica no resultado de todas as
+            # linhas do grupo, sem interromper o lote
+            resultado = novoResultado()
+            resultado['mensagem_validacao'] = f"Erro ao processar entrada: {e}"
+        resultado['chave_canonica'] = chave
+        resultados[linhas[0]] = resultado
+        for i in linhas[1:]:
+            resultados[i] = copy.deepcopy(resultado)
+
+    return resultados
+
+
+# RENDERIZAÇÃO (TEXTO, LATEX, JSON, MATHML)
+class EscritorBuffer:
+    """
+    Acumula a saída em memória e grava no destino em blocos grandes, em vez
+    de uma chamada de escrita por linha. Pode ser compartilhado por vários
+    renderizadores num mesmo lote.
+
+    Exemplo:
+        with EscritorBuffer(arquivo) as escritor:
+            for resultado in resultados:
+                renderizaLatex(resultado, escritor)
+    """
+
+    def __init__(self, destino=None, limite=1 << 16):
+        self.destino = destino
+        self.limite = limite
+        self.partes = []
+        self.tamanho = 0
+
+    def escreve(self, texto):
+        self.partes.append(texto)
+        self.tamanho += len(texto)
+        if self.tamanho >= self.limite:
+            self.descarrega()
+
+    def descarrega(self):
+        if self.partes:
+            destino = self.destino if self.destino is not None else sys.stdout
+            destino.write("".join(self.partes))
+            self.partes = []
+            self.tamanho = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.descarrega()
+        return False
+
+
+def parcelasIntegral(termos):
+    """
+    Integral de uma lista de termos como parcelas estruturadas (mesmas
+    fórmulas de integraCadaTermo), agrupadas por fator como em
+    geraFonteAntiderivada. Usada pelos renderizadores:
+        {'tipo': 'ln', 'coef', 'base'}
+        {'tipo': 'arctan', 'coef', 'argumento': (s₀, s₁)}  → arctan(s₁x + s₀)
+        {'tipo': 'racional', 'coef', 'base', 'potencia', 'derivada'}
+            → coef·(2ax + b)/base^j se 'derivada', senão coef/base^j
+    onde base é a lista de coeficientes de ax + b ou ax² + bx + c.
+    """
+    lineares = {}
+    quadraticos = {}
+    for termo in termos:
+        _acumulaTermo(termo, lineares, quadraticos)
+
+    # Parcelas desprezíveis em relação à maior (não em valor absoluto: com
+    # denominadores de líder grande todos os coeficientes são pequenos)
+    grupos = list(lineares.values()) + list(quadraticos.values())
+    valores = [abs(grupo[chave]) for grupo in grupos for chave in ('ln', 'atan') if chave in grupo]
+    valores += [abs(v) for grupo in grupos for chave in ('racional', 'derivada') for v in grupo.get(chave, {}).values()]
+    tol = 1e-12 * max(valores, default=0.0)
+
+    parcelas = []
+    for (a, b), grupo in lineares.items():
+        if abs(grupo['ln']) > tol:
+            parcelas.append({'tipo': 'ln', 'coef': grupo['ln'], 'base': [b, a]})
+        for j, coef in sorted(grupo['racional'].items()):
+            if abs(coef) > tol:
+                parcelas.append({'tipo': 'racional', 'coef': coef, 'base': [b, a], 'potencia': j, 'derivada': False})
+
+    for (a, b, c), grupo in quadraticos.items():
+        if abs(grupo['ln']) > tol:
+            parcelas.append({'tipo': 'ln', 'coef': grupo['ln'], 'base': [c, b, a]})
+        if abs(grupo['atan']) > tol:
+            raiz_delta = math.sqrt(4*a*c - b**2)
+            parcelas.append({'tipo': 'arctan', 'coef': 2 * grupo['atan'] / raiz_delta,
+                             'argumento': (b / raiz_delta, 2*a / raiz_delta)})
+        for chave, derivada in (('racional', False), ('derivada', True)):
+            for j, coef in sorted(grupo[chave].items()):
+                if abs(coef) > tol:
+                    parcelas.append({'tipo': 'racional', 'coef': coef, 'base': [c, b, a],
+                                     'potencia': j, 'derivada': derivada})
+
+    return parcelas
+
+
+def _numero(valor, precisao):
+    # + 0.0 normaliza o zero negativo (-0.0 → 0.0)
+    return f"{valor + 0.0:.{precisao}g}"
+
+
+def _significativos(valor, precisao):
+    """Arredonda para a quantidade de algarismos significativos"""
+    return float(_numero(valor, precisao))
+
+
+def mensagemValidacao(resultado, precisao=4):
+    """Mensagem de validação, com a fração válida escrita na precisão dada"""
+    if resultado.get('fracao') is None:
+        return resultado['mensagem_validacao']
+    num, den = resultado['fracao']
+    return f"Fração válida: ({Polinomio(num).formata(precisao)}) / ({Polinomio(den).formata(precisao)})"
+
+
+def fatorCancelado(resultado, precisao=4):
+    """Fator comum cancelado na precisão dada ('' se não houve cancelamento)"""
+    if resultado.get('fator_comum') is None:
+        return resultado.get('fator_cancelado') or ''
+    return Polinomio(resultado['fator_comum']).formata(precisao)
+
+
+def renderizaTexto(resultado, escritor, precisao=4):
+    """Renderizador em texto (mesmo layout do console)"""
+    linhas = ["\n" + "="*70, "RESULTADO DA INTEGRAÇÃO POR FRAÇÕES PARCIAIS", "="*70]
+    linhas.append(f"\n1. VALIDAÇÃO: {mensagemValidacao(resultado, precisao)}")
+    if fatorCancelado(resultado, precisao):
+        linhas.append(f"   Fator comum cancelado: ({fatorCancelado(resultado, precisao)})")
+
+    if not resultado['valido']:
+        escritor.escreve("\n".join(linhas) + "\n")
+        return
+
+    info = resultado['info_fatoracao']
+    linhas.append(f"\n2. TIPO DE FATORAÇÃO: {resultado['tipo_fatoracao'].upper()}")
+    linhas.append(f"   Descrição: {info['descricao']}")
+    linhas.append(f"   Fatores: {formataFatoracao(resultado['tipo_fatoracao'], info, precisao)}")
+
+    parte_racional = formataParteRacional(resultado.get('parte_racional_termos') or [], precisao)
+
+    linhas.append(f"\n3. DECOMPOSIÇÃO EM FRAÇÕES PARCIAIS:")
+    if parte_racional:
+        linhas.append(f"   Parte racional (redução de Hermite): {parte_racional}")
+    termos = termosNaoNulos(resultado['decomposicao'])
+    for i, termo in enumerate(termos, 1):
+        linhas.append(f"   Termo {i}: {formaTermo(termo, precisao)}")
+
+    integrais = [integraCadaTermo(termo, precisao) for termo in termos]
+    linhas.append(f"\n4. INTEGRAÇÃO DE CADA TERMO:")
+    for i, integral in enumerate(integrais, 1):
+        linhas.append(f"   ∫ Termo {i} dx = {integral}")
+
+    partes = ([parte_racional] if parte_racional else []) + integrais
+    linhas.append(f"\n5. RESULTADO FINAL:")
+    linhas.append(f"   ∫ f(x) dx = {' + '.join(partes) + ' + C' if partes else 'C'}")
+    linhas.append("\n" + "="*70 + "\n")
+
+    escritor.escreve("\n".join(linhas) + "\n")
+
+
+def _numeroLatex(valor, precisao):
+    texto = _numero(valor, precisao)
+    if 'e' in texto:
+        mantissa, expoente = texto.split('e')
+        texto = f"{mantissa} \\times 10^{{{int(expoente)}}}"
+    return texto
+
+
+def _polinomioLatex(coefs, precisao):
+    termos = []
+    for i in range(len(coefs) - 1, -1, -1):
+        c = coefs[i]
+        if abs(c) < 1e-10:
+            continue
+        sinal = "-" if c < 0 else ("+" if termos else "")
+        valor = "" if abs(abs(c) - 1) < 1e-10 and i > 0 else _numeroLatex(abs(c), precisao)
+        potencia = "" if i == 0 else ("x" if i == 1 else f"x^{{{i}}}")
+        termos.append(f"{sinal} {valor}{potencia}".strip() if termos else f"{sinal}{valor}{potencia}")
+    return " ".join(termos) if termos else "0"
+
+
+def _somaLatex(parcelas):
+    """Junta (coeficiente, corpo) com sinais corretos; corpo recebe |coef|"""
+    texto = ""
+    for coef, corpo in parcelas:
+        if not texto:
+            texto = f"-{corpo}" if coef < 0 else corpo
+        else:
+            texto += f" - {corpo}" if coef < 0 else f" + {corpo}"
+    return texto or "0"
+
+
+def _termoLatex(termo, precisao):
+    k = termo.get('potencia', 1)
+    if termo['tipo'] in ('linear', 'linear_repetido', 'linear_geral'):
+        numerador = _numeroLatex(abs(termo['coeficiente']), precisao)
+        base = [-termo['raiz'], 1] if 'raiz' in termo else termo['fator']
+        coef = termo['coeficiente']
+    else:
+        C, D = termo['numerador']
+        a, b, c = termo['denominador']
+        numerador = _polinomioLatex([D, C], precisao)
+        base = [c, b, a]
+        coef = 1
+    denominador = _polinomioLatex(base, precisao)
+    if k > 1:
+        denominador = f"\\left({denominador}\\right)^{{{k}}}"
+    return coef, f"\\frac{{{numerador}}}{{{denominador}}}"
+
+
+def _parcelaLatex(parcela, precisao):
+    coef = parcela['coef']
+    valor = _numeroLatex(abs(coef), precisao)
+    fator = "" if valor == "1" else f"{valor} "
+    if parcela['tipo'] == 'ln':
+        return coef, f"{fator}\\ln\\left|{_polinomioLatex(parcela['base'], precisao)}\\right|"
+    if parcela['tipo'] == 'arctan':
+        return coef, f"{fator}\\arctan\\left({_polinomioLatex(list(parcela['argumento']), precisao)}\\right)"
+
+    base = _polinomioLatex(parcela['base'], precisao)
+    j = parcela['potencia']
+    denominador = base if j == 1 else f"\\left({base}\\right)^{{{j}}}"
+    numerador = valor
+    if parcela['derivada']:
+        a, b = parcela['base'][-1], parcela['base'][-2]
+        numerador = f"{valor}\\left({_polinomioLatex([b, 2*a], precisao)}\\right)"
+    return coef, f"\\frac{{{numerador}}}{{{denominador}}}"
+
+
+def renderizaLatex(resultado, escritor, precisao=4):
+    """Renderizador LaTeX (ambiente aligned, um bloco por integral)"""
+    if not resultado['valido']:
+        escritor.escreve(f"% {resultado['mensagem_validacao']}\n")
+        return
+
+    termos = termosNaoNulos(resultado['decomposicao'])
+    decomposicao = _somaLatex([_termoLatex(t, precisao) for t in termos])
+    parcelas = []
+    for g, Q, j in resultado.get('parte_racional_termos') or ():
+        base = _polinomioLatex(Q, precisao)
+        if j > 1:
+            base = f"\\left({base}\\right)^{{{j}}}"
+        parcelas.append((1, f"\\frac{{{_polinomioLatex(g, precisao)}}}{{{base}}}"))
+    parcelas += [_parcelaLatex(p, precisao) for p in parcelasIntegral(termos)]
+
+    escritor.escreve(
+        "\\begin{aligned}\n"
+        f"f(x) &= {decomposicao} \\\\\n"
+        f"\\int f(x)\\,dx &= {_somaLatex(parcelas) + ' + C' if parcelas else 'C'}\n"
+        "\\end{aligned}\n"
+    )
+
+
+def renderizaJson(resultado, escritor, precisao=4):
+    """Renderizador JSON (uma linha por integral, formato JSON Lines)"""
+    def arredonda(valor):
+        if isinstance(valor, float):
+            return _significativos(valor, precisao)
+        if isinstance(valor, (list, tuple)):
+            return [arredonda(v) for v in valor]
+        return valor
+
+    saida = {
+        'valido': resultado['valido'],
+        'mensagem_validacao': mensagemValidacao(resultado, precisao),
+    }
+    if resultado['valido']:
+        info = resultado['info_fatoracao']
+        saida.update({
+            'tipo_fatoracao': resultado['tipo_fatoracao'],
+            'fatores': formataFatoracao(resultado['tipo_fatoracao'], info, precisao),
+            'fator_cancelado': fatorCancelado(resultado, precisao) or None,
+            'parte_racional': [
+                {'numerador': arredonda(g), 'base': arredonda(Q), 'potencia': j}
+                for g, Q, j in resultado.get('parte_racional_termos') or ()
+            ],
+            'decomposicao': [
+                dict({nome: arredonda(valor) for nome, valor in termo.items() if nome != 'forma'},
+                     forma=formaTermo(termo, precisao))
+                for termo in termosNaoNulos(resultado['decomposicao'])
+            ],
+            'integrais': [
+                {
+                    'texto': integraCadaTermo(termo, precisao),
+                    'parcelas': [{nome: arredonda(valor) for nome, valor in parcela.items()}
+                                 for parcela in parcelasIntegral([termo])]
+                }
+                for termo in termosNaoNulos(resultado['decomposicao'])
+            ],
+        })
+    escritor.escreve(json.dumps(saida, ensure_ascii=False) + "\n")
+
+
+def _numeroMathml(valor, precisao):
+    return f"<mn>{_numero(valor, precisao)}</mn>"
+
+
+def _polinomioMathml(coefs, precisao):
+    partes = []
+    for i in range(len(coefs) - 1, -1, -1):
+        c = coefs[i]
+        if abs(c) < 1e-10:
+            continue
+        if c < 0:
+            partes.append("<mo>-</mo>")
+        elif partes:
+            partes.append("<mo>+</mo>")
+        if not (abs(abs(c) - 1) < 1e-10 and i > 0):
+            partes.append(_numeroMathml(abs(c), precisao))
+        if i == 1:
+            partes.append("<mi>x</mi>")
+        elif i > 1:
+            partes.append(f"<msup><mi>x</mi><mn>{i}</mn></msup>")
+    return "<mrow>" + ("".join(partes) or "<mn>0</mn>") + "</mrow>"
+
+
+def _parcelaMathml(parcela, precisao):
+    valor = _numeroMathml(abs(parcela['coef']), precisao)
+    fator = "" if valor == "<mn>1</mn>" else valor
+    if parcela['tipo'] == 'ln':
+        return (f"<mrow>{fator}<mi>ln</mi><mo>|</mo>"
+                f"{_polinomioMathml(parcela['base'], precisao)}<mo>|</mo></mrow>")
+    if parcela['tipo'] == 'arctan':
+        return (f"<mrow>{fator}<mi>arctan</mi><mo>(</mo>"
+                f"{_polinomioMathml(list(parcela['argumento']), precisao)}<mo>)</mo></mrow>")
+
+    base = _polinomioMathml(parcela['base'], precisao)
+    j = parcela['potencia']
+    denominador = base if j == 1 else f"<msup><mrow><mo>(</mo>{base}<mo>)</mo></mrow><mn>{j}</mn></msup>"
+    numerador = valor
+    if parcela['derivada']:
+        a, b = parcela['base'][-1], parcela['base'][-2]
+        numerador = f"<mrow>{valor}<mo>(</mo>{_polinomioMathml([b, 2*a], precisao)}<mo>)</mo></mrow>"
+    return f"<mfrac>{numerador}{denominador}</mfrac>"
+
+
+def renderizaMathml(resultado, escritor, precisao=4):
+    """Renderizador MathML (um elemento <math> por integral)"""
+    if not resultado['valido']:
+        escritor.escreve(f"<!-- {resultado['mensagem_validacao']} -->\n")
+        return
+
+    partes = []
+    for g, Q, j in resultado.get('parte_racional_termos') or ():
+        base = _polinomioMathml(Q, precisao)
+        if j > 1:
+            base = f"<msup><mrow><mo>(</mo>{base}<mo>)</mo></mrow><mn>{j}</mn></msup>"
+        partes.append((1, f"<mfrac>{_polinomioMathml(g, precisao)}{base}</mfrac>"))
+    partes += [(p['coef'], _parcelaMathml(p, precisao))
+               for p in parcelasIntegral(termosNaoNulos(resultado['decomposicao']))]
+
+    corpo = ""
+    for coef, parte in partes:
+        if coef < 0:
+            corpo += "<mo>-</mo>"
+        elif corpo:
+            corpo += "<mo>+</mo>"
+        corpo += parte
+    corpo += ("<mo>+</mo>" if corpo else "") + "<mi>C</mi>"
+
+    escritor.escreve(
+        '<math xmlns="http://www.w3.org/1998/Math/MathML"><mrow>'
+        "<mo>∫</mo><mi>f</mi><mo>(</mo><mi>x</mi><mo>)</mo><mi>d</mi><mi>x</mi><mo>=</mo>"
+        f"{corpo}</mrow></math>\n"
+    )
+
+
+RENDERIZADORES = {
+    'texto': renderizaTexto,
+    'latex': renderizaLatex,
+    'json': renderizaJson,
+    'mathml': renderizaMathml,
+}
+
+
+def renderizaResultados(resultados, formato='texto', destino=None, precisao=4, limite=1 << 16):
+    """
+    Renderiza um lote de resultados num único escritor com buffer.
+
+    Parâmetros:
+        formato: chave de RENDERIZADORES ('texto', 'latex', 'json', 'mathml');
+                 novos formatos podem ser registrados no dicionário
+        destino: arquivo/stream de saída (padrão: sys.stdout)
+        precisao: algarismos significativos dos números
+        limite: tamanho do buffer (caracteres) antes de gravar no destino
+    """
+    if formato not in RENDERIZADORES:
+        raise ValueError(f"Formato desconhecido: {formato}. Use um de: {', '.join(RENDERIZADORES)}")
+
+    renderizador = RENDERIZADORES[formato]
+    with EscritorBuffer(destino, limite) as escritor:
+        for resultado in resultados:
+            renderizador(resultado, escritor, precisao)
+
+
+def renderizaFormato(resultado, formato='texto', precisao=4):
+    """
+    Renderiza um único resultado e devolve a string (útil como
+    renderizar= do pipelineIntegrais, via functools.partial).
+    """
+    destino = io.StringIO()
+    renderizaResultados([resultado], formato, destino, precisao)
+    return destino.getvalue()
+
+
+# PIPELINE EM LOTES
+ETAPAS_PIPELINE = ('parse', 'validacao', 'classificacao', 'decomposicao', 'integracao', 'renderizacao')
+ESPERA_PIPELINE = 0.1  # segundos entre verificações do sinal de parada
+
+
+class _FalhaPipeline:
+    """Marca repassada adiante quando uma etapa falha por completo"""
+
+    def __init__(self, erro):
+        self.erro = erro
+
+
+def etapaParse(item):
+    """Converte as strings de entrada em polinômios"""
+    numerador_str, denominador_str = item['entrada']
+    item['numerador'] = parsePolinomio(numerador_str)
+    item['denominador'] = parsePolinomio(denominador_str)
+    return item
+
+
+def renderizaResumo(resultado):
+    """Renderização mínima: uma linha com o resultado final"""
+    if not resultado['valido']:
+        return resultado['mensagem_validacao']
+    return f"∫ f(x) dx = {resultado['resultado_final']}"
+
+
+def etapaRenderizacao(item, renderizar=renderizaResumo):
+    """Gera a saída textual do item"""
+    item['saida'] = renderizar(item['resultado'])
+    return item
+
+
+def _funcoesEtapas(renderizar=renderizaResumo):
+    """Função de cada etapa de ETAPAS_PIPELINE"""
+    return {
+        'parse': etapaParse,
+        'validacao': etapaValidacao,
+        'classificacao': etapaClassificacao,
+        'decomposicao': etapaDecomposicao,
+        'integracao': etapaIntegracao,
+        'renderizacao': partial(etapaRenderizacao, renderizar=renderizar),
+    }
+
+
+def _processaLote(etapa, lote, ignora_erros=True):
+    """
+    Aplica a etapa a cada item do lote. Um erro num item fica registrado
+    nele (como no modo interativo) sem interromper os demais.
+    """
+    for item in lote:
+        if ignora_erros and 'erro' in item:
+            continue
+        try:
+            etapa(item)
+        except Exception as e:
+            item['erro'] = f"Erro ao processar entrada: {e}"
+            item['resultado']['valido'] = False
+            item['resultado']['mensagem_validacao'] = item['erro']
+    return lote
+
+
+def _entrega(fila, valor, parar):
+    """
+    Coloca o valor na fila, desistindo se o pipeline for encerrado
+    enquanto a fila estiver cheia.
+    """
+    while not parar.is_set():
+        try:
+            fila.put(valor, timeout=ESPERA_PIPELINE)
+            return
+        except queue.Full:
+            pass
+
+
+def _recebe(fila, parar):
+    """Retira um valor da fila; devolve None se o pipeline for encerrado"""
+    while not parar.is_set():
+        try:
+            return fila.get(timeout=ESPERA_PIPELINE)
+        except queue.Empty:
+            pass
+    return None
+
+
+def _trabalhadorEtapa(etapa, entrada, saida, executor, em_voo, ignora_erros, parar):
+    """
+    Laço de uma etapa: consome lotes da fila de entrada e entrega na fila
+    de saída, na mesma ordem. Com um executor (threads ou processos),
+    mantém até em_voo lotes sendo processados ao mesmo tempo. Termina
+    quando o evento parar é sinalizado.
+    """
+    pendentes = deque()
+    lote = None
+    try:
+        while not parar.is_set():
+            lote = _recebe(entrada, parar)
+            if lote is None or isinstance(lote, _FalhaPipeline):
+                break
+            if executor is None:
+                _entrega(saida, _processaLote(etapa, lote, ignora_erros), parar)
+            else:
+                pendentes.append(executor.submit(_processaLote, etapa, lote, ignora_erros))
+                if len(pendentes) >= em_voo:
+                    _entrega(saida, pendentes.popleft().result(), parar)
+        while pendentes and not parar.is_set():
+            _entrega(saida, pendentes.popleft().result(), parar)
+        _entrega(saida, lote, parar)
+    except BaseException as e:
+        _entrega(saida, _FalhaPipeline(e), parar)
+    finally:
+        for futuro in pendentes:
+            futuro.cancel()
+
+
+def _alimentaPipeline(entradas, fila, tamanho_lote, hermite, parar):
+    """Agrupa as entradas em lotes de itens e coloca na primeira fila"""
+    try:
+        lote = []
+        for entrada in entradas:
+            if parar.is_set():
+                return
+            lote.append({'entrada': entrada, 'hermite': hermite, 'resultado': novoResultado()})
+            if len(lote) == tamanho_lote:
+                _entrega(fila, lote, parar)
+                lote = []
+        if lote:
+            _entrega(fila, lote, parar)
+        _entrega(fila, None, parar)
+    except BaseException as e:
+        _entrega(fila, _FalhaPipeline(e), parar)
+
+
+def pipelineIntegrais(entradas, tamanho_lote=64, capacidade=4, executores=None,
+                      hermite=False, renderizar=renderizaResumo):
+    """
+    Processa um fluxo de integrais em lotes, com as etapas
+    parse → validação → classificação → decomposição → integração → renderização
+    rodando em paralelo, cada uma na sua thread, ligadas por filas limitadas.
+    Com fluxos grandes, a vazão tende à da etapa mais lenta, e não à soma
+    de todas.
+
+    Parâmetros:
+        entradas: iterável de (numerador_str, denominador_str), pode ser infinito
+        tamanho_lote: itens por lote
+        capacidade: lotes que cabem em cada fila entre etapas (e lotes em
+                    processamento por executor)
+        executores: {nome_etapa: Executor} para rodar uma etapa num pool de
+                    threads ou processos, ex:
+                    {'decomposicao': ProcessPoolExecutor(4)}
+                    As etapas ausentes rodam direto na thread da etapa.
+        renderizar: função resultado → texto (precisa ser de nível de
+                    módulo se a renderização rodar num pool de processos)
+
+    Exemplo:
+        for item in pipelineIntegrais([("3x + 5", "(x-1)(x-2)"), ("1", "x^2+1")]):
+            print(item['saida'])
+
+    Interromper o consumo (break, close() do gerador ou uma etapa que
+    falha) encerra todas as threads do pipeline.
+
+    Gera:
+        itens {'entrada', 'resultado', 'saida', ...} na ordem das entradas
+    """
+    executores = executores or {}
+    desconhecidas = set(executores) - set(ETAPAS_PIPELINE)
+    if desconhecidas:
+        raise ValueError(f"Etapas desconhecidas: {', '.join(sorted(desconhecidas))}")
+
+    funcoes = _funcoesEtapas(renderizar)
+    parar = threading.Event()
+    filas = [queue.Queue(maxsize=capacidade) for _ in range(len(ETAPAS_PIPELINE) + 1)]
+    threads = [threading.Thread(target=_alimentaPipeline,
+                                args=(entradas, filas[0], tamanho_lote, hermite, parar), daemon=True)]
+    for i, nome in enumerate(ETAPAS_PIPELINE):
+        threads.append(threading.Thread(
+            target=_trabalhadorEtapa,
+            args=(funcoes[nome], filas[i], filas[i + 1], executores.get(nome),
+                  capacidade, nome != 'renderizacao', parar),
+            daemon=True
+        ))
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            lote = filas[-1].get()
+            if lote is None:
+                break
+            if isinstance(lote, _FalhaPipeline):
+                raise lote.erro
+            yield from lote
+    finally:
+        parar.set()
+
+
+# PERFIL DE MEMÓRIA
+def _sitesAlocacao(antes, depois, top):
+    """Linhas do código com mais memória alocada (e ainda viva) entre os snapshots"""
+    estatisticas = depois.compare_to(antes, 'lineno')
+    sites = []
+    for estatistica in estatisticas:
+        if estatistica.size_diff <= 0:
+            continue
+        quadro = estatistica.traceback[0]
+        sites.append({
+            'local': f"{quadro.filename}:{quadro.lineno}",
+            'codigo': linecache.getline(quadro.filename, quadro.lineno).strip(),
+            'bytes': estatistica.size_diff,
+            'blocos': estatistica.count_diff,
+        })
+        if len(sites) == top:
+            break
+    return sites
+
+
+# Funções do caminho quente com pico de memória medido a cada chamada
+FUNCOES_PERFIL = ('parsePolinomio', 'extrairFatores', 'parsePolinomioSimples',
+                  'multiplicarPolinomios', 'SistemaLinear.resolver')
+
+
+class _MedidorPicos:
+    """
+    Picos de memória de medições aninhadas (etapas e chamadas de funções).
+    O tracemalloc tem um único pico global: antes de cada reset_peak o pico
+    atual é repassado a todas as medições abertas, de modo que uma chamada
+    interna não apaga o máximo da externa.
+    """
+
+    def __init__(self, nomes=()):
+        self.abertas = []
+        self.funcoes = {nome: {'chamadas': 0, 'pico': 0} for nome in nomes}
+
+    def _repassa(self):
+        pico = tracemalloc.get_traced_memory()[1]
+        for medida in self.abertas:
+            medida[1] = max(medida[1], pico)
+
+    def abre(self):
+        self._repassa()
+        atual = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        medida = [atual, atual]
+        self.abertas.append(medida)
+        return medida
+
+    def fecha(self, medida):
+        """Retorna o pico da medição acima da memória no início dela"""
+        self._repassa()
+        self.abertas.pop()
+        return medida[1] - medida[0]
+
+    def instrumenta(self, nome, funcao):
+        registro = self.funcoes[nome]
+
+        @wraps(funcao)
+        def medida(*args, **kwargs):
+            inicio = self.abre()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                registro['chamadas'] += 1
+                registro['pico'] = max(registro['pico'], self.fecha(inicio))
+        return medida
+
+
+def _instrumentaFuncao(medidor, nome):
+    """
+    Troca a função (do módulo, ou 'Classe.metodo') pela versão medida.
+
+    Retorna:
+        (dono, atributo, original) para restaurar
+    """
+    dono, _, atributo = nome.rpartition('.')
+    dono = getattr(sys.modules[__name__], dono) if dono else sys.modules[__name__]
+    original = vars(dono)[atributo]
+    if isinstance(original, staticmethod):
+        setattr(dono, atributo, staticmethod(medidor.instrumenta(nome, original.__func__)))
+    else:
+        setattr(dono, atributo, medidor.instrumenta(nome, original))
+    return dono, atributo, original
+
+
+def _filtrosProprios(*funcoes):
+    """Filtros do tracemalloc que descartam as linhas do próprio perfil"""
+    filtros = []
+    codigos = [funcao.__code__ for funcao in funcoes if hasattr(funcao, '__code__')]
+    while codigos:
+        codigo = codigos.pop()
+        codigos.extend(c for c in codigo.co_consts if hasattr(c, 'co_code'))
+        for _, linha in dis.findlinestarts(codigo):
+            if linha is not None:
+                filtros.append(tracemalloc.Filter(False, codigo.co_filename, linha))
+    return filtros
+
+
+def perfilMemoria(entradas, top=10, hermite=False, renderizar=renderizaResumo, imprimir=True,
+                  funcoes=FUNCOES_PERFIL):
+    """
+    Perfil de alocações (tracemalloc) das etapas do pipeline sobre um lote.
+    As etapas rodam em sequência, cada uma sobre o lote inteiro, e para
+    cada uma são medidos:
+        pico: maior memória alocada durante a etapa, acima do início dela
+        retido: memória e blocos que continuam vivos ao fim da etapa
+                (resultados intermediários guardados nos itens e caches)
+        temporario: pico - retido, memória alocada e já liberada durante a
+                    etapa (ex.: as cópias da matriz em SistemaLinear.resolver)
+        sites: as top linhas do código com mais memória retida
+
+    Os sites comparam snapshots do início e do fim da etapa, então só
+    aparecem alocações ainda vivas. Para atribuir também os temporários,
+    as funções do caminho quente (funcoes) são instrumentadas durante o
+    perfil: a cada chamada o pico é zerado (tracemalloc.reset_peak) e lido
+    ao fim, e cada função registra o número de chamadas e o maior pico de
+    uma chamada. As linhas do próprio perfil ficam fora dos snapshots.
+    O pico usa tracemalloc.reset_peak (Python 3.9+); em versões anteriores
+    pico e temporario ficam None e as funções não são medidas.
+
+    Parâmetros:
+        entradas: lista de (numerador_str, denominador_str)
+        top: quantidade de locais de alocação listados por etapa
+        funcoes: nomes das funções medidas por chamada ('Classe.metodo'
+                 para métodos)
+
+    Retorna:
+        {'quantidade', 'etapas': {nome: {'pico', 'retido', 'temporario', 'blocos', 'sites'}},
+         'funcoes': {nome: {'chamadas', 'pico'}}}
+    """
+    etapas_funcoes = _funcoesEtapas(renderizar)
+    itens = [{'entrada': entrada, 'hermite': hermite, 'resultado': novoResultado()} for entrada in entradas]
+
+    # reset_peak só existe a partir do Python 3.9
+    tem_pico = hasattr(tracemalloc, 'reset_peak')
+    medidor = _MedidorPicos(funcoes if tem_pico else ())
+    filtros = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ] + _filtrosProprios(perfilMemoria, _instrumentaFuncao, *vars(_MedidorPicos).values())
+
+    ja_ativo = tracemalloc.is_tracing()
+    if not ja_ativo:
+        tracemalloc.start()
+    originais = []
+
+    etapas = {}
+    try:
+        for nome in medidor.funcoes:
+            originais.append(_instrumentaFuncao(medidor, nome))
+        for nome in ETAPAS_PIPELINE:
+            antes = tracemalloc.take_snapshot().filter_traces(filtros)
+            inicial = tracemalloc.get_traced_memory()[0]
+            medida = medidor.abre() if tem_pico else None
+
+            _processaLote(etapas_funcoes[nome], itens, nome != 'renderizacao')
+
+            pico = medidor.fecha(medida) if tem_pico else None
+            retido = tracemalloc.get_traced_memory()[0] - inicial
+            depois = tracemalloc.take_snapshot().filter_traces(filtros)
+            etapas[nome] = {
+                'pico': pico,
+                'retido': retido,
+                'temporario': pico - retido if tem_pico else None,
+                'blocos': sum(e.count_diff for e in depois.compare_to(antes, 'filename')),
+                'sites': _sitesAlocacao(antes, depois, top),
+            }
+    finally:
+        for dono, atributo, original in originais:
+            setattr(dono, atributo, original)
+        if not ja_ativo:
+            tracemalloc.stop()
+
+    relatorio = {'quantidade': len(itens), 'etapas': etapas, 'funcoes': medidor.funcoes}
+
+    if imprimir:
+        print("\n" + "="*70)
+        print("PERFIL DE MEMÓRIA POR ETAPA")
+        print("="*70)
+        print(f"Integrais: {len(itens)} (hermite={hermite})")
+        print(f"\n{'Etapa':<15}{'Pico KiB':>10}{'Retido KiB':>12}{'Temp. KiB':>11}{'Blocos':>9}{'B/integral':>12}")
+        for nome, medida in etapas.items():
+            if tem_pico:
+                por_integral = medida['pico'] / len(itens) if itens else 0
+                pico = f"{medida['pico'] / 1024:>10.1f}"
+                temporario = f"{medida['temporario'] / 1024:>11.1f}"
+                por_integral = f"{por_integral:>12.0f}"
+            else:
+                pico, temporario, por_integral = f"{'n/d':>10}", f"{'n/d':>11}", f"{'n/d':>12}"
+            print(f"{nome:<15}{pico}{medida['retido'] / 1024:>12.1f}"
+                  f"{temporario}{medida['blocos']:>9}{por_integral}")
+        if not tem_pico:
+            print("\nPico por etapa indisponível: tracemalloc.reset_peak requer Python 3.9+")
+        else:
+            print(f"\n{'Função':<28}{'Chamadas':>10}{'Pico/chamada KiB':>18}")
+            for nome, medida in medidor.funcoes.items():
+                print(f"{nome:<28}{medida['chamadas']:>10}{medida['pico'] / 1024:>18.1f}")
+        for nome, medida in etapas.items():
+            if medida['sites']:
+                print(f"\n{nome}: maiores locais de alocação")
+                for site in medida['sites']:
+                    print(f"   {site['bytes'] / 1024:>8.1f} KiB {site['blocos']:>6} blocos  {site['local']}")
+                    print(f"      {site['codigo']}")
+        print("\nNota: os locais listam só a memória ainda viva ao fim de cada etapa;")
+        print("os temporários já liberados aparecem na coluna Temp. e no pico por")
+        print("chamada das funções medidas.")
+        print("="*70 + "\n")
+
+    return relatorio
+
 
 # INTERFACE INTERATIVA
 def menuInterativo():
@@ -894,14 +3454,39 @@ def executarExemplos():
 def main():
     """
     Função principal - escolhe entre modo interativo ou exemplos.
+    
+    Também pode ser chamada sem interação:
+        python TP.py --verificar [quantidade [grau_max [multiplicidade_max]]] [--hermite]
+        python TP.py --lote [texto|latex|json|mathml] < entradas.txt
+        python TP.py --perfil-memoria [quantidade]
+    (no modo lote, cada linha da entrada é "numerador ; denominador")
     """
+    if len(sys.argv) > 1 and sys.argv[1] == '--verificar':
+        numeros = [int(a) for a in sys.argv[2:] if a != '--hermite']
+        parametros = dict(zip(('quantidade', 'grau_max', 'multiplicidade_max'), numeros))
+        relatorio = executarVerificacao(hermite='--hermite' in sys.argv, **parametros)
+        sys.exit(1 if relatorio['falhas'] else 0)
+    
+    if len(sys.argv) > 1 and sys.argv[1] == '--perfil-memoria':
+        quantidade = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+        casos = casosAleatorios(random.Random(0), quantidade)
+        perfilMemoria([(n, d) for n, d, _ in casos])
+        return
+    
+    if len(sys.argv) > 1 and sys.argv[1] == '--lote':
+        formato = sys.argv[2] if len(sys.argv) > 2 else 'texto'
+        entradas = [tuple(parte.strip() for parte in linha.split(';', 1)) for linha in sys.stdin if ';' in linha]
+        renderizaResultados(calculaLote(entradas), formato)
+        return
+    
     print("\n" + "="*70)
     print("BEM-VINDO AO SISTEMA DE INTEGRAÇÃO POR FRAÇÕES PARCIAIS")
     print("="*70)
     print("\nEscolha uma opção:")
     print("1. Modo interativo (inserir valores manualmente)")
     print("2. Executar exemplos automáticos")
-    print("3. Sair")
+    print("3. Verificação automática (frações aleatórias)")
+    print("4. Sair")
     
     opcao = input("\nOpção: ")
     
@@ -909,6 +3494,8 @@ def main():
         menuInterativo()
     elif opcao == '2':
         executarExemplos()
+    elif opcao == '3':
+        executarVerificacao()
     else:
         print("\nEncerrando o programa. Até logo!")
 